@@ -0,0 +1,263 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections import OrderedDict
+from functools import cache
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Protocol,
+    Tuple,
+    TypeVar,
+)
+
+from pydantic import TypeAdapter
+
+from app.backend.config import config
+
+
+T = TypeVar("T")
+
+
+@cache
+def type_adapter(type_: Any) -> TypeAdapter[Any]:
+    """Return cached adapter validating JSON of cached values."""
+
+    return TypeAdapter(type_)
+
+
+class CacheStats:
+    """Cache usage counters."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class CacheBackend(ABC):
+    """Interface of cache backends.
+
+    :meth:`get` returns :obj:`None` on a miss, so :obj:`None` itself is
+    never cached. Backends storing values out of process serialize them
+    as JSON and validate them as ``type_`` when they are read.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    @abstractmethod
+    async def get(self, key: str, type_: Any = Any) -> Any | None:
+        """Return cached value or :obj:`None` if missing."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store value, by default for :attr:`ttl` seconds."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Remove values from cache."""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Increment integer counter and return its new value."""
+
+    @abstractmethod
+    async def counter(self, key: str) -> int:
+        """Return current value of integer counter."""
+
+    def size(self) -> int:
+        """Return number of stored values, -1 if unknown."""
+
+        return -1
+
+    async def get_or_set(
+            self,
+            key: str,
+            factory: Callable[[], Awaitable[T]],
+            type_: Any = Any,
+    ) -> T:
+        """Return cached value of ``type_``, computing and storing it on a miss."""
+
+        value = await self.get(key, type_)
+        if value is not None:
+            return value
+
+        value = await factory()
+        await self.set(key, value)
+        return value
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process cache with per entry TTL and LRU eviction.
+
+    At most ``max_entries`` values are stored, the least recently used
+    one is evicted when the limit is reached. Counters are kept apart
+    from values and are never evicted.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._counters: Dict[str, int] = dict()
+
+    async def get(self, key: str, type_: Any = Any) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def clear(self) -> None:
+        """Remove all values and counters."""
+
+        self._data.clear()
+        self._counters.clear()
+
+    def size(self) -> int:
+        return len(self._data)
+
+
+class SharedCacheClient(Protocol):
+    """Subset of asynchronous key-value client API used by the shared
+    backend, e.g. ``redis.asyncio.Redis``."""
+
+    async def get(self, name: str) -> bytes | None:
+        ...
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> Any:
+        ...
+
+    async def delete(self, *names: str) -> Any:
+        ...
+
+    async def incr(self, name: str) -> int:
+        ...
+
+
+class SharedCacheBackend(CacheBackend):
+    """Cache stored in an external key-value server shared by workers.
+
+    Values are stored as JSON, never pickled, so whoever can write to
+    the server cannot make the workers run code. Expiration and eviction
+    are handled by the server.
+    """
+
+    def __init__(self, client: SharedCacheClient, ttl: float) -> None:
+        super().__init__(ttl)
+        self.client = client
+
+    async def get(self, key: str, type_: Any = Any) -> Any | None:
+        data = await self.client.get(key)
+        if data is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return type_adapter(type_).validate_json(data)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        ex = max(1, int(self.ttl if ttl is None else ttl))
+        await self.client.set(key, type_adapter(Any).dump_json(value), ex=ex)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+    async def counter(self, key: str) -> int:
+        return int(await self.client.get(key) or 0)
+
+
+class NullCacheBackend(CacheBackend):
+    """Backend that stores nothing, used when caching is disabled."""
+
+    async def get(self, key: str, type_: Any = Any) -> Any | None:
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    async def incr(self, key: str) -> int:
+        return 0
+
+    async def counter(self, key: str) -> int:
+        return 0
+
+    def size(self) -> int:
+        return 0
+
+
+def create_cache() -> CacheBackend:
+    """Create cache backend from :class:`app.backend.config.CacheConfig`."""
+
+    if not config.cache.enabled:
+        return NullCacheBackend(config.cache.ttl)
+    return MemoryCacheBackend(config.cache.ttl, config.cache.max_entries)
+
+
+_cache = create_cache()
+
+
+def get_cache() -> CacheBackend:
+    """Return cache backend used by the services."""
+
+    return _cache
+
+
+def set_cache(backend: CacheBackend) -> None:
+    """Replace cache backend, e.g. with a shared one."""
+
+    global _cache
+    _cache = backend
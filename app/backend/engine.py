@@ -0,0 +1,179 @@
+import threading
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+from sqlalchemy import (
+    create_engine,
+    Engine,
+    make_url,
+)
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    create_async_engine,
+)
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    NullPool,
+    Pool,
+    QueuePool,
+)
+
+from app.backend.config import (
+    config,
+    DatabaseConfig,
+)
+from app.const import DEFAULT_SCHEMA
+
+
+class PoolWaitStats:
+    """Accumulated time spent waiting for a connection from the pool."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += elapsed
+            self.max = max(self.max, elapsed)
+
+
+class WaitStatsMixin:
+    """Measures how long checkouts wait for a connection."""
+
+    wait_stats: PoolWaitStats
+
+    def _do_get(self) -> Any:
+        if not hasattr(self, "wait_stats"):
+            self.wait_stats = PoolWaitStats()
+
+        start = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            self.wait_stats.record(time.perf_counter() - start)
+
+
+class StatsQueuePool(WaitStatsMixin, QueuePool):
+    pass
+
+
+class StatsAsyncAdaptedQueuePool(WaitStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(
+    database: DatabaseConfig, dsn: str, is_async: bool
+) -> Dict[str, Any]:
+    """Build engine keyword arguments from database configuration."""
+
+    backend = make_url(dsn).get_backend_name()
+    options: Dict[str, Any] = {"pool_pre_ping": database.pool_pre_ping}
+
+    if backend == "sqlite":
+        # SQLite has no schemas, keep the tables in the main database
+        options["execution_options"] = {
+            "schema_translate_map": {DEFAULT_SCHEMA: None}
+        }
+
+    if database.null_pool:
+        options["poolclass"] = NullPool
+    elif backend != "sqlite":
+        options.update(
+            poolclass=StatsAsyncAdaptedQueuePool if is_async else StatsQueuePool,
+            pool_size=database.pool_size,
+            max_overflow=database.max_overflow,
+            pool_recycle=database.pool_recycle,
+            pool_timeout=database.pool_timeout,
+        )
+
+    if database.statement_timeout is not None and backend == "postgresql":
+        timeout = str(database.statement_timeout)
+        if is_async:
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": timeout}
+            }
+        else:
+            options["connect_args"] = {
+                "options": f"-c statement_timeout={timeout}"
+            }
+
+    return options
+
+
+_engines: Dict[str, Engine] = dict()
+_async_engines: Dict[str, AsyncEngine] = dict()
+
+
+def get_engine(dsn: str | None = None) -> Engine:
+    """Return shared engine for the given DSN.
+
+    Engines are created once per process and DSN, so every consumer
+    shares a single connection pool.
+    """
+
+    dsn = dsn or config.database.dsn
+    if dsn not in _engines:
+        _engines[dsn] = create_engine(
+            dsn, **engine_options(config.database, dsn, is_async=False)
+        )
+    return _engines[dsn]
+
+
+def get_async_engine(dsn: str | None = None) -> AsyncEngine:
+    """Return shared asynchronous engine for the given DSN."""
+
+    dsn = dsn or config.database.get_async_dsn()
+    if dsn not in _async_engines:
+        _async_engines[dsn] = create_async_engine(
+            dsn, **engine_options(config.database, dsn, is_async=True)
+        )
+    return _async_engines[dsn]
+
+
+def pool_stats(name: str, pool: Pool) -> Dict[str, Any]:
+    """Collect live metrics of a connection pool."""
+
+    stats: Dict[str, Any] = {
+        "name": name,
+        "pool_class": type(pool).__name__,
+        "size": 0,
+        "checked_in": 0,
+        "checked_out": 0,
+        "overflow": 0,
+    }
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+
+    wait_stats = getattr(pool, "wait_stats", None) or PoolWaitStats()
+    stats.update(
+        wait_count=wait_stats.count,
+        wait_time_total=wait_stats.total,
+        wait_time_max=wait_stats.max,
+    )
+    return stats
+
+
+def all_pool_stats() -> List[Dict[str, Any]]:
+    """Collect metrics of every engine created by this process."""
+
+    stats = [
+        pool_stats(repr(engine.url), engine.pool) for engine in _engines.values()
+    ]
+    stats += [
+        pool_stats(repr(engine.url), engine.pool)
+        for engine in _async_engines.values()
+    ]
+    return stats
@@ -0,0 +1,81 @@
+import asyncio
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import (
+    Any,
+    Callable,
+    List,
+    Sequence,
+    TypeVar,
+)
+
+from app.backend.config import config
+
+
+T = TypeVar("T")
+
+
+def split(items: Sequence[T], parts: int) -> List[Sequence[T]]:
+    """Split ``items`` into at most ``parts`` consecutive parts of equal size."""
+
+    size = -(-len(items) // parts) or 1
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+class HashingExecutor:
+    """Bounded worker pool for CPU heavy password hashing.
+
+    bcrypt releases the GIL while hashing, so a thread pool is enough to
+    keep the event loop responsive and to use all available cores. The
+    number of jobs submitted at once is limited to ``workers + queue_size``,
+    extra callers wait for a free slot instead of growing the queue.
+
+    Bulk jobs such as user imports may use worker ``processes`` instead,
+    which also parallelizes the Python code around the hashing itself.
+    """
+
+    def __init__(self, workers: int, queue_size: int, processes: bool = False) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor: Executor
+        if processes:
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="hashing"
+            )
+        self._slots = asyncio.Semaphore(workers + queue_size)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in the worker pool and await the result."""
+
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def map(
+            self, fn: Callable[[Sequence[Any]], List[T]], items: Sequence[Any]
+    ) -> List[T]:
+        """Split ``items`` between workers and run ``fn`` over each part.
+
+        ``fn`` accepts a list of items and returns a list of results,
+        results are returned in the order of ``items``.
+        """
+
+        parts = split(items, self.workers)
+        results = await asyncio.gather(*(self.run(fn, part) for part in parts))
+        return [result for part in results for result in part]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop worker threads."""
+
+        self._executor.shutdown(wait=wait)
+
+
+hashing_executor = HashingExecutor(
+    workers=config.hashing.workers,
+    queue_size=config.hashing.queue_size,
+)
@@ -0,0 +1,291 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+import asyncio
+import pickle
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Protocol,
+    Set,
+)
+
+from loguru import logger
+
+from app.backend.config import config
+
+
+JobHandler = Callable[..., Awaitable[None]]
+
+
+class Job:
+    """Call of a registered handler, pickled by durable backends.
+
+    Attributes:
+        name:
+            Name the handler is registered under.
+        kwargs:
+            Keyword arguments of the handler.
+        attempts:
+            Number of failed attempts so far.
+        receipt:
+            Backend specific handle of a received job, used to acknowledge it.
+    """
+
+    def __init__(self, name: str, kwargs: Dict[str, Any], attempts: int = 0) -> None:
+        self.name = name
+        self.kwargs = kwargs
+        self.attempts = attempts
+        self.receipt: Any = None
+
+
+class JobBackend(ABC):
+    """Interface of job queue backends.
+
+    A received job stays with the backend until it is acknowledged, so
+    durable backends can deliver it again after a crash.
+    """
+
+    @abstractmethod
+    async def put(self, job: Job) -> None:
+        """Add job to the end of the queue."""
+
+    @abstractmethod
+    async def get(self) -> Job:
+        """Wait for the next job."""
+
+    @abstractmethod
+    async def ack(self, job: Job) -> None:
+        """Mark received job as done."""
+
+    async def recover(self) -> None:
+        """Queue again jobs received but not acknowledged before a restart."""
+
+    async def join(self) -> None:
+        """Wait until all queued jobs are done.
+
+        Durable backends return at once, their jobs survive restarts.
+        """
+
+    def size(self) -> int:
+        """Return number of queued jobs, -1 if unknown."""
+
+        return -1
+
+
+class MemoryJobBackend(JobBackend):
+    """In-process queue holding at most ``max_size`` jobs.
+
+    Jobs are lost when the process stops before they are done.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(max_size)
+
+    async def put(self, job: Job) -> None:
+        await self._queue.put(job)
+
+    async def get(self) -> Job:
+        return await self._queue.get()
+
+    async def ack(self, job: Job) -> None:
+        self._queue.task_done()
+
+    async def join(self) -> None:
+        await self._queue.join()
+
+    def size(self) -> int:
+        return self._queue.qsize()
+
+
+class SharedQueueClient(Protocol):
+    """Subset of asynchronous list API of a key-value server used by the
+    shared backend, e.g. ``redis.asyncio.Redis``."""
+
+    async def rpush(self, name: str, *values: bytes) -> Any:
+        ...
+
+    async def blmove(
+        self, first_list: str, second_list: str, timeout: int, src: str, dest: str
+    ) -> bytes | None:
+        ...
+
+    async def lmove(
+        self, first_list: str, second_list: str, src: str, dest: str
+    ) -> bytes | None:
+        ...
+
+    async def lrem(self, name: str, count: int, value: bytes) -> Any:
+        ...
+
+
+class SharedJobBackend(JobBackend):
+    """Durable queue stored in lists of an external key-value server.
+
+    Received jobs are atomically moved to a processing list of the
+    ``consumer`` and removed from it once acknowledged. Jobs left there
+    by a crashed process are queued again by :meth:`recover`, so every
+    process needs its own consumer name, stable across restarts.
+    """
+
+    def __init__(
+        self, client: SharedQueueClient, name: str = "jobs", consumer: str = "default"
+    ) -> None:
+        self.client = client
+        self.pending = name
+        self.processing = f"{name}:processing:{consumer}"
+        self._size = -1
+
+    async def put(self, job: Job) -> None:
+        self._size = await self.client.rpush(self.pending, pickle.dumps(job))
+
+    async def get(self) -> Job:
+        while True:
+            data = await self.client.blmove(
+                self.pending, self.processing, 1, "LEFT", "RIGHT"
+            )
+            if data is not None:
+                job = pickle.loads(data)
+                job.receipt = data
+                return job
+
+    async def ack(self, job: Job) -> None:
+        await self.client.lrem(self.processing, 1, job.receipt)
+
+    async def recover(self) -> None:
+        moved = 0
+        while await self.client.lmove(
+            self.processing, self.pending, "RIGHT", "LEFT"
+        ) is not None:
+            moved += 1
+        if moved:
+            logger.warning("{} unfinished jobs queued again", moved)
+
+    def size(self) -> int:
+        return self._size
+
+
+class JobQueue:
+    """Runs side effects of writes in background workers.
+
+    Handlers are registered by name with :meth:`job` and called with
+    the keyword arguments passed to :meth:`enqueue`. A failing job is
+    retried ``max_retries`` times with exponential backoff, then it is
+    logged and dropped.
+
+    Until :meth:`start` is called, e.g. in command line tools, jobs run
+    right away in the caller.
+    """
+
+    def __init__(
+        self,
+        backend: JobBackend,
+        workers: int,
+        max_retries: int,
+        retry_delay: float,
+    ) -> None:
+        self.backend = backend
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.handlers: Dict[str, JobHandler] = dict()
+        self._workers: List[asyncio.Task] = []
+        self._retries: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def job(self, name: str) -> Callable[[JobHandler], JobHandler]:
+        """Register decorated coroutine function as handler of ``name`` jobs."""
+
+        def register(handler: JobHandler) -> JobHandler:
+            self.handlers[name] = handler
+            return handler
+
+        return register
+
+    async def enqueue(self, name: str, **kwargs: Any) -> None:
+        """Queue job, waits while the queue is full."""
+
+        if name not in self.handlers:
+            raise KeyError(f"Unknown job {name}")
+
+        job = Job(name, kwargs)
+        if not self.running:
+            await self._execute(job)
+            return
+        await self.backend.put(job)
+
+    async def start(self) -> None:
+        """Start workers, queued jobs of a previous run are processed first."""
+
+        await self.backend.recover()
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+
+    async def drain(self, timeout: float) -> None:
+        """Wait up to ``timeout`` seconds for queued jobs, then stop workers."""
+
+        try:
+            await asyncio.wait_for(self.backend.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Job queue not drained in {} s, {} jobs left",
+                timeout,
+                self.backend.size(),
+            )
+
+        tasks = self._workers + list(self._retries)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._retries.clear()
+
+    async def _execute(self, job: Job) -> bool:
+        try:
+            await self.handlers[job.name](**job.kwargs)
+        except Exception:
+            logger.exception("Job {} failed, attempt {}", job.name, job.attempts + 1)
+            return False
+        return True
+
+    async def _work(self) -> None:
+        while True:
+            job = await self.backend.get()
+            if not await self._execute(job):
+                if job.attempts < self.max_retries:
+                    task = asyncio.create_task(self._retry(job))
+                    self._retries.add(task)
+                    task.add_done_callback(self._retries.discard)
+                    continue
+                logger.error(
+                    "Job {} dropped after {} attempts", job.name, job.attempts + 1
+                )
+            await self.backend.ack(job)
+
+    async def _retry(self, job: Job) -> None:
+        """Queue failed job again after a delay, then acknowledge it.
+
+        The failed job stays unacknowledged during the delay, so durable
+        backends keep it if the process stops meanwhile.
+        """
+
+        await asyncio.sleep(self.retry_delay * 2 ** job.attempts)
+        retry = Job(job.name, job.kwargs, job.attempts + 1)
+        await self.backend.put(retry)
+        await self.backend.ack(job)
+
+
+job_queue = JobQueue(
+    MemoryJobBackend(config.jobs.queue_size),
+    workers=config.jobs.workers,
+    max_retries=config.jobs.max_retries,
+    retry_delay=config.jobs.retry_delay,
+)
@@ -0,0 +1,209 @@
+import json
+import queue
+import sys
+import threading
+import time
+import traceback
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    TextIO,
+    Tuple,
+)
+
+from loguru import logger
+
+from app.backend.config import (
+    config,
+    LoggingConfig,
+)
+
+
+def json_line(record: Dict[str, Any]) -> str:
+    """Format loguru record as a JSON object, extra fields included."""
+
+    data = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        **record["extra"],
+    }
+    if record["exception"] is not None:
+        data["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    return json.dumps(data, default=str)
+
+
+def text_line(record: Dict[str, Any]) -> str:
+    """Format loguru record as a plain line, extra fields appended."""
+
+    line = (
+        f"{record['time']:%Y-%m-%d %H:%M:%S.%f} | {record['level'].name:<8} | "
+        f"{record['name']}:{record['function']}:{record['line']} - "
+        f"{record['message']}"
+    )
+    if record["extra"]:
+        line += " | " + " ".join(f"{k}={v}" for k, v in record["extra"].items())
+    if record["exception"] is not None:
+        line += "\n" + "".join(traceback.format_exception(*record["exception"]))
+    return line
+
+
+class BatchingSink:
+    """Loguru sink writing records from a background thread.
+
+    Logging calls only put the record into a bounded queue. Records are
+    formatted and written by the writer thread in batches of up to
+    ``batch_size`` and the stream is flushed once per batch. When the
+    queue is full, records are dropped and counted rather than making
+    the caller wait. A batch failing to be written is reported to the
+    interpreter's original stderr and dropped, the thread keeps running.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        formatter: Callable[[Dict[str, Any]], str],
+        queue_size: int,
+        batch_size: int,
+    ) -> None:
+        self.stream = stream
+        self.formatter = formatter
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue: queue.Queue[Dict[str, Any] | None] = queue.Queue(queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message: Any) -> None:
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            self.dropped += 1
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until queued records are written.
+
+        Returns:
+            :obj:`False` if ``timeout`` seconds passed first.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self) -> None:
+        """Write queued records and stop the writer thread."""
+
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            records: List[Dict[str, Any] | None] = [self._queue.get()]
+            while len(records) < self.batch_size:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopped = None in records
+            try:
+                self._write(records)
+            except Exception:
+                if sys.__stderr__ is not None:
+                    print(
+                        f"Failed to write {len(records)} log records",
+                        file=sys.__stderr__,
+                    )
+                    traceback.print_exc(file=sys.__stderr__)
+            finally:
+                for _ in records:
+                    self._queue.task_done()
+
+    def _write(self, records: List[Dict[str, Any] | None]) -> None:
+        lines = [self.formatter(record) for record in records if record]
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            message = f"{dropped} log records dropped, the queue was full"
+            if self.formatter is json_line:
+                message = json.dumps({"level": "WARNING", "message": message})
+            lines.append(message)
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+
+
+class LogSampler:
+    """Lets through at most ``limit`` records per key in every ``window``
+    seconds, e.g. per route, status code and error detail."""
+
+    def __init__(self, limit: int | None, window: float, max_keys: int = 10_000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        # key -> window start, records let through and records suppressed
+        self._keys: Dict[Hashable, Tuple[float, int, int]] = dict()
+        self._lock = threading.Lock()
+
+    def sample(self, key: Hashable) -> int | None:
+        """Decide whether to log a record.
+
+        Returns:
+            :obj:`None` if the record is to be suppressed, otherwise
+            the number of records of the key suppressed since the last
+            one let through.
+        """
+
+        if self.limit is None:
+            return 0
+
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._keys and len(self._keys) >= self.max_keys:
+                self._keys.clear()
+
+            start, count, suppressed = self._keys.get(key, (now, 0, 0))
+            if now - start >= self.window:
+                start, count = now, 0
+            if count >= self.limit:
+                self._keys[key] = (start, count, suppressed + 1)
+                return None
+            self._keys[key] = (start, count + 1, 0)
+            return suppressed
+
+
+# sampler of logged error responses
+error_sampler = LogSampler(
+    config.logging.error_sample_limit, config.logging.error_sample_window
+)
+
+
+def configure_logging(settings: LoggingConfig = config.logging) -> BatchingSink:
+    """Replace the default synchronous stderr sink by a batching one."""
+
+    formatter = json_line if settings.format == "json" else text_line
+    sink = BatchingSink(sys.stderr, formatter, settings.queue_size, settings.batch_size)
+    logger.remove()
+    logger.add(
+        sink,
+        level=settings.level,
+        format="{message}",
+        colorize=False,
+        backtrace=False,
+        diagnose=False,
+    )
+    return sink
@@ -0,0 +1,344 @@
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+)
+
+from loguru import logger
+from sqlalchemy import (
+    Engine,
+    event,
+)
+
+from app.backend.config import config
+
+
+# upper bounds of histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Cumulative histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Return ``(le, count)`` pairs including the ``+Inf`` bucket."""
+
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result += [(repr(bound), total)]
+        return result + [("+Inf", self.count)]
+
+
+class QueryBudgetExceeded(Exception):
+    """SQL statements executed within a scope exceeded its budget."""
+
+
+class QueryBudget:
+    """Limits of SQL statements executed by a request or a block of code.
+
+    Attributes:
+        max_queries:
+            Maximum number of statements.
+        max_repeats:
+            Maximum number of executions of the same statement, exceeding
+            it usually means an N+1 query pattern.
+        strict:
+            Raise :class:`QueryBudgetExceeded` instead of logging a warning.
+    """
+
+    def __init__(
+        self,
+        max_queries: int | None = None,
+        max_repeats: int | None = None,
+        strict: bool = False,
+    ) -> None:
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.strict = strict
+
+    @classmethod
+    def from_config(cls) -> "QueryBudget | None":
+        """Return request budget from configuration, if any is set."""
+
+        metrics = config.metrics
+        if metrics.query_budget is None and metrics.repeated_query_limit is None:
+            return None
+        return cls(
+            metrics.query_budget,
+            metrics.repeated_query_limit,
+            metrics.strict_query_budget,
+        )
+
+    def check(self, metrics: "RequestMetrics", statement: str) -> None:
+        """Report the statement that has just exceeded the budget.
+
+        Every limit is reported only once per scope.
+        """
+
+        problem = None
+        if self.max_queries is not None and metrics.sql_count == self.max_queries + 1:
+            problem = (
+                f"{metrics.sql_count} SQL statements exceed "
+                f"the budget of {self.max_queries}"
+            )
+        repeats = metrics.statements[statement]
+        if self.max_repeats is not None and repeats == self.max_repeats + 1:
+            problem = f"Possible N+1 query, executed {repeats} times: {statement}"
+
+        if problem is None:
+            return
+        if self.strict:
+            raise QueryBudgetExceeded(problem)
+        logger.warning(problem)
+
+
+class RequestMetrics:
+    """Timings collected while a single request is processed.
+
+    Metrics of a nested scope, see :func:`query_budget`, are added to
+    their ``parent`` as well.
+
+    Attributes:
+        sql_count:
+            Number of executed SQL statements.
+        sql_time:
+            Total execution time of the SQL statements, in seconds.
+        statements:
+            Number of executions of every SQL statement text.
+        timings:
+            Total time spent in named phases such as password hashing.
+    """
+
+    def __init__(
+        self,
+        budget: QueryBudget | None = None,
+        parent: "RequestMetrics | None" = None,
+    ) -> None:
+        self.budget = budget
+        self.parent = parent
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.statements: Counter[str] = Counter()
+        self.timings: Dict[str, float] = dict()
+
+    def add(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        if self.parent is not None:
+            self.parent.add(name, seconds)
+
+    def add_statement(self, statement: str, seconds: float) -> None:
+        self.sql_count += 1
+        self.sql_time += seconds
+        self.statements[statement] += 1
+        if self.budget is not None:
+            self.budget.check(self, statement)
+        if self.parent is not None:
+            self.parent.add_statement(statement, seconds)
+
+    def server_timing(self, total: float) -> str:
+        """Format timings as a ``Server-Timing`` header value."""
+
+        sql = f'sql;dur={self.sql_time * 1e3:.2f};desc="{self.sql_count} queries"'
+        metrics = [sql] + [
+            f"{name};dur={seconds * 1e3:.2f}"
+            for name, seconds in self.timings.items()
+        ]
+        return ", ".join(metrics + [f"total;dur={total * 1e3:.2f}"])
+
+
+# metrics of the request being processed in the current context
+current_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_metrics", default=None
+)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Add time spent in the block to the current request metrics."""
+
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - start)
+
+
+@contextmanager
+def query_budget(
+    max_queries: int | None = None,
+    max_repeats: int | None = None,
+    strict: bool = True,
+) -> Iterator[RequestMetrics]:
+    """Limit SQL statements executed within the block.
+
+    Meant for tests of services and data managers, e.g.::
+
+        with query_budget(max_queries=2, max_repeats=1):
+            await ArticleService(session).update_article(1, item, user)
+
+    Yields:
+        Metrics of the block.
+    """
+
+    metrics = RequestMetrics(
+        QueryBudget(max_queries, max_repeats, strict), parent=current_metrics.get()
+    )
+    token = current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        current_metrics.reset(token)
+
+
+class MetricsRegistry:
+    """Process wide request and SQL statistics."""
+
+    def __init__(self) -> None:
+        self.requests: Dict[Tuple[str, str, int], Histogram] = dict()
+        self.sql = Histogram()
+        self.sql_by_route: Dict[Tuple[str, str], Tuple[int, float]] = dict()
+        self._lock = threading.Lock()
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        seconds: float,
+        metrics: RequestMetrics,
+    ) -> None:
+        key = (method, route, status_code)
+        with self._lock:
+            if key not in self.requests:
+                self.requests[key] = Histogram()
+            count, total = self.sql_by_route.get((method, route), (0, 0.0))
+            self.sql_by_route[(method, route)] = (
+                count + metrics.sql_count,
+                total + metrics.sql_time,
+            )
+        self.requests[key].observe(seconds)
+
+    def render(self) -> str:
+        """Render metrics in the Prometheus text exposition format."""
+
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status_code), histogram in sorted(self.requests.items()):
+            labels = f'method="{method}",route="{route}",status="{status_code}"'
+            lines += _histogram_lines(
+                "http_request_duration_seconds", labels, histogram
+            )
+
+        lines += [
+            "# HELP sql_statements_total SQL statements executed by route.",
+            "# TYPE sql_statements_total counter",
+        ]
+        sql_by_route = sorted(self.sql_by_route.items())
+        lines += [
+            f'sql_statements_total{{method="{method}",route="{route}"}} {count}'
+            for (method, route), (count, _) in sql_by_route
+        ]
+        lines += [
+            "# HELP sql_statements_seconds_total SQL execution time by route.",
+            "# TYPE sql_statements_seconds_total counter",
+        ]
+        lines += [
+            f'sql_statements_seconds_total{{method="{method}",route="{route}"}} '
+            f"{total}"
+            for (method, route), (_, total) in sql_by_route
+        ]
+
+        lines += [
+            "# HELP sql_statement_duration_seconds SQL statement latency.",
+            "# TYPE sql_statement_duration_seconds histogram",
+        ]
+        lines += _histogram_lines("sql_statement_duration_seconds", "", self.sql)
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> List[str]:
+    separator = "," if labels else ""
+    lines = [
+        f'{name}_bucket{{{labels}{separator}le="{le}"}} {count}'
+        for le, count in histogram.cumulative()
+    ]
+    braces = f"{{{labels}}}" if labels else ""
+    return lines + [
+        f"{name}_sum{braces} {histogram.sum}",
+        f"{name}_count{braces} {histogram.count}",
+    ]
+
+
+registry = MetricsRegistry()
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    context.query_start = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    elapsed = time.perf_counter() - context.query_start
+    registry.sql.observe(elapsed)
+
+    threshold = config.metrics.slow_query_threshold
+    if threshold is not None and elapsed >= threshold:
+        logger.warning("Slow query ({:.3f} s): {}", elapsed, statement)
+
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.add_statement(statement, elapsed)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time SQL statements executed by the engine."""
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,121 @@
+import itertools
+import time
+from typing import (
+    Any,
+    Dict,
+    List,
+    Sequence,
+)
+
+from loguru import logger
+from sqlalchemy import (
+    Connection,
+    Engine,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+
+class ReplicaRouter:
+    """Chooses read replica for read only sessions.
+
+    A replica whose connection fails is ejected for ``retry_interval``
+    seconds, then it is tried again. Opening a connection serves as the
+    health check, enable ``pool_pre_ping`` to also test pooled ones.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        strategy: str = "round_robin",
+        retry_interval: float = 30.0,
+    ) -> None:
+        self.engines = list(engines)
+        self.strategy = strategy
+        self.retry_interval = retry_interval
+        # ejected replica indexes and the time they are tried again
+        self._ejected: Dict[int, float] = dict()
+        self._counter = itertools.count()
+
+    def healthy(self) -> List[int]:
+        """Return indexes of replicas that are not ejected."""
+
+        now = time.monotonic()
+        return [
+            i for i in range(len(self.engines)) if self._ejected.get(i, 0.0) <= now
+        ]
+
+    def choose(self, exclude: Sequence[int] = ()) -> int | None:
+        """Return index of the replica to use, :obj:`None` if none is healthy."""
+
+        candidates = [i for i in self.healthy() if i not in exclude]
+        if not candidates:
+            return None
+
+        if self.strategy == "least_connections":
+            return min(candidates, key=self.checked_out)
+        return candidates[next(self._counter) % len(candidates)]
+
+    def checked_out(self, index: int) -> int:
+        checkedout = getattr(self.engines[index].pool, "checkedout", None)
+        return checkedout() if checkedout is not None else 0
+
+    def eject(self, index: int) -> None:
+        self._ejected[index] = time.monotonic() + self.retry_interval
+        logger.warning(
+            "Replica {} ejected for {} s", self.engines[index].url, self.retry_interval
+        )
+
+    def restore(self, index: int) -> None:
+        if self._ejected.pop(index, None) is not None:
+            logger.info("Replica {} restored", self.engines[index].url)
+
+    def connect(self) -> Engine | None:
+        """Return engine of a healthy replica after testing its connection.
+
+        Replicas failing to connect are ejected and the next one is tried.
+        Blocks on the connection, so it is called by :class:`ReplicaSession`
+        within the greenlet of an asynchronous session.
+
+        Returns:
+            Synchronous engine of a replica or :obj:`None` if none is
+            available.
+        """
+
+        tried: List[int] = []
+        while (index := self.choose(tried)) is not None:
+            engine = self.engines[index].sync_engine
+            try:
+                with engine.connect():
+                    pass
+            except (DBAPIError, OSError):
+                self.eject(index)
+                tried += [index]
+                continue
+
+            self.restore(index)
+            return engine
+        return None
+
+
+class ReplicaSession(Session):
+    """Session reading from a replica chosen by its first statement.
+
+    Used as ``sync_session_class`` of read only asynchronous sessions,
+    so a request served entirely from cache never takes a connection.
+    The session's own bind, the primary, is used if no replica is
+    available.
+    """
+
+    def __init__(self, *args: Any, router: ReplicaRouter, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.router = router
+        self._replica: Engine | None = None
+        self._routed = False
+
+    def get_bind(self, mapper: Any = None, **kw: Any) -> Engine | Connection:
+        if not self._routed:
+            self._replica = self.router.connect()
+            self._routed = True
+        return self._replica or super().get_bind(mapper, **kw)
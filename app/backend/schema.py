@@ -0,0 +1,25 @@
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.backend.engine import (
+    get_async_engine,
+    get_engine,
+)
+from app.models import (  # noqa: F401 (register models in metadata)
+    articles,
+    auth,
+)
+from app.models.base import SQLModel
+
+
+def create_schema(engine: Engine | None = None) -> None:
+    """Create database tables of all models that do not exist yet."""
+
+    SQLModel.metadata.create_all(engine or get_engine())
+
+
+async def create_schema_async(engine: AsyncEngine | None = None) -> None:
+    """Create database tables of all models using asynchronous engine."""
+
+    async with (engine or get_async_engine()).begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
@@ -1,23 +1,71 @@
-from contextlib import contextmanager
-from typing import Iterator
+from contextlib import (
+    asynccontextmanager,
+    contextmanager,
+)
+from typing import (
+    AsyncIterator,
+    Iterator,
+)
 
-from sqlalchemy import create_engine
+from fastapi import (
+    Request,
+    Response,
+)
+from sqlalchemy.ext.asyncio import (
+    async_sessionmaker,
+    AsyncSession,
+)
 from sqlalchemy.orm import (
     Session,
     sessionmaker,
 )
 
 from app.backend.config import config
+from app.backend.engine import (
+    get_async_engine,
+    get_engine,
+)
+from app.backend.metrics import instrument_engine
+from app.backend.replicas import (
+    ReplicaRouter,
+    ReplicaSession,
+)
+
+
+# read replicas serving the read only sessions
+replica_router = ReplicaRouter(
+    [get_async_engine(dsn) for dsn in config.database.get_replica_async_dsns()],
+    strategy=config.database.replica_strategy,
+    retry_interval=config.database.replica_retry_interval,
+)
 
+# count and time SQL statements of every request
+if config.metrics.enabled:
+    instrument_engine(get_engine())
+    for engine in [get_async_engine(), *replica_router.engines]:
+        instrument_engine(engine.sync_engine)
 
-# create session factory to generate new database sessions
+# cookie marking clients that have just written, they read from the primary
+PRIMARY_COOKIE = "myapi_primary"
+
+# key of ``session.info`` telling services whether to use the cache
+USE_CACHE = "use_cache"
+
+# create session factory to generate new database sessions, used by the CLI
 SessionFactory = sessionmaker(
-    bind=create_engine(config.database.dsn),
+    bind=get_engine(),
     autocommit=False,
     autoflush=False,
     expire_on_commit=False,
 )
 
+# create session factory to generate new asynchronous database sessions
+AsyncSessionFactory = async_sessionmaker(
+    bind=get_async_engine(),
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 
 def create_session() -> Iterator[Session]:
     """Create new database session.
@@ -47,3 +95,107 @@ def open_session() -> Iterator[Session]:
     """
 
     return create_session()
+
+
+async def create_async_session() -> AsyncIterator[AsyncSession]:
+    """Create new asynchronous database session.
+
+    Yields:
+        Asynchronous database session.
+    """
+
+    session = AsyncSessionFactory()
+
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+@asynccontextmanager
+def open_async_session() -> AsyncIterator[AsyncSession]:
+    """Create new asynchronous database session with context manager.
+
+    Yields:
+        Asynchronous database session.
+    """
+
+    return create_async_session()
+
+
+def open_replica_session() -> AsyncSession:
+    """Create session reading from a healthy replica.
+
+    The replica is chosen by the first statement of the session, see
+    :class:`~app.backend.replicas.ReplicaSession`. The primary database
+    is used if there are no replicas or all of them are ejected.
+    """
+
+    if not replica_router.engines:
+        return AsyncSessionFactory()
+    return AsyncSessionFactory(sync_session_class=ReplicaSession, router=replica_router)
+
+
+async def create_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Create new read only database session.
+
+    Sessions are connected to a replica unless the client has written
+    within :attr:`~app.backend.config.DatabaseConfig.read_your_writes_window`,
+    then the primary is used so the client reads its own writes and
+    the services are told to bypass the cache by :data:`USE_CACHE`.
+
+    Yields:
+        Asynchronous database session.
+    """
+
+    if request.cookies.get(PRIMARY_COOKIE):
+        # the cache may hold values read from a lagging replica
+        session = AsyncSessionFactory(info={USE_CACHE: False})
+    else:
+        session = open_replica_session()
+
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def create_write_session(response: Response) -> AsyncIterator[AsyncSession]:
+    """Create new database session connected to the primary.
+
+    If replicas are configured, the client is marked to read from
+    the primary for a while, see :func:`create_read_session`.
+
+    Yields:
+        Asynchronous database session.
+    """
+
+    if replica_router.engines:
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            "1",
+            max_age=config.database.read_your_writes_window,
+            httponly=True,
+        )
+
+    async with open_async_session() as session:
+        yield session
+
+
+@asynccontextmanager
+async def open_read_session() -> AsyncIterator[AsyncSession]:
+    """Create new read only session connected to a replica.
+
+    Yields:
+        Asynchronous database session.
+    """
+
+    session = open_replica_session()
+    try:
+        yield session
+    finally:
+        await session.close()
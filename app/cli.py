@@ -1,11 +1,105 @@
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+)
+from itertools import islice
+import os
+import time
+from typing import (
+    Collection,
+    Dict,
+    List,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
 import click
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
+from app.backend.config import config
+from app.backend.hashing import split
+from app.backend.schema import create_schema
 from app.backend.session import open_session
+from app.const import ADMIN_GROUP
+from app.export import (
+    ExportFormat,
+    EXTENSIONS,
+    iter_export_chunks,
+    read_records,
+)
+from app.models.auth import UserModel
+from app.schemas.articles import ArticleSchema
 from app.schemas.auth import CreateUserSchema
-from app.services.auth import AuthService, GroupService
+from app.services.articles import SyncArticleDataManager
+from app.services.auth import (
+    hash_passwords,
+    pwd_context,
+    SyncAuthDataManager,
+    SyncGroupDataManager,
+)
 from app.version import __version__
 
 
+def add_user(session: Session, user: CreateUserSchema) -> UserModel:
+    """Add user with hashed password, the session context commits."""
+
+    model = UserModel(
+        name=user.name, email=user.email, password=pwd_context.hash(user.password)
+    )
+    try:
+        SyncAuthDataManager(session).add_user(model)
+    except IntegrityError:
+        raise click.ClickException(
+            "The user with specified email address already exists"
+        )
+    return model
+
+
+def import_batch(
+    session: Session,
+    users: Sequence[CreateUserSchema],
+    groups: Collection[str],
+    executor: Executor,
+    workers: int,
+) -> List[UserModel]:
+    """Add users whose email addresses are not taken yet and commit them.
+
+    See :meth:`app.services.auth.AuthService.import_users`.
+    """
+
+    unique: Dict[str, CreateUserSchema] = dict()
+    for user in users:
+        unique.setdefault(user.email, user)
+
+    data_manager = SyncAuthDataManager(session)
+    taken = data_manager.get_taken_emails(unique)
+    new_users = [user for user in unique.values() if user.email not in taken]
+    if not new_users:
+        return []
+
+    parts = split([user.password for user in new_users], workers)
+    passwords = [
+        password
+        for hashed in executor.map(hash_passwords, parts)
+        for password in hashed
+    ]
+    models = data_manager.add_users(
+        [
+            dict(name=user.name, email=user.email, password=password)
+            for user, password in zip(new_users, passwords)
+        ]
+    )
+    if groups:
+        SyncGroupDataManager(session).add_users_to_groups(
+            [model.id for model in models], groups
+        )
+    session.commit()
+    return models
+
+
 @click.group(invoke_without_command=True)
 @click.option("--version", is_flag=True, help="Show package version")
 def main(version: bool) -> None:
@@ -15,6 +109,21 @@ def main(version: bool) -> None:
         click.echo("Version: " + __version__)
 
 
+@main.command()
+def init_db() -> None:
+    """Create database tables.
+
+    Create tables of all models that do not exist yet in the database.
+
+    \b
+    Examples:
+        myapi init-db
+    """
+
+    create_schema()
+    click.echo("Database tables created.")
+
+
 @main.command()
 @click.option("--name", type=str, help="User name")
 @click.option("--email", type=str, help="Email")
@@ -34,7 +143,7 @@ def create_user(name: str, email: str, password: str) -> None:
 
     # write to database
     with open_session() as session:
-        AuthService(session).create_user(user)
+        add_user(session, user)
 
 
 @main.command()
@@ -56,5 +165,149 @@ def create_admin_user(name: str, email: str, password: str) -> None:
 
     # write to database
     with open_session() as session:
-        user_model = AuthService(session).create_user(user)
-        GroupService(session).add_user_to_admin_group(user_model)
+        user_model = add_user(session, user)
+        data_manager = SyncGroupDataManager(session)
+        data_manager.get_or_create_admin_group()
+        data_manager.add_users_to_groups([user_model.id], [ADMIN_GROUP])
+    click.echo("Admin user created.")
+    if config.cache.enabled:
+        click.echo(
+            "Running workers may not see the new membership for up to "
+            f"{config.cache.ttl:g} seconds, until their cached groups expire."
+        )
+
+
+@main.command()
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice([f.value for f in ExportFormat]),
+    default=ExportFormat.ndjson.value,
+    help="Output format",
+)
+@click.option(
+    "--after-id", type=int, default=0, help="Resume after article with this id"
+)
+@click.option(
+    "--output", type=click.File("w"), default="-", help="Output file, stdout by default"
+)
+def export_articles(export_format: str, after_id: int, output: TextIO) -> None:
+    """Export articles.
+
+    Stream all articles ordered by id to a file in NDJSON or CSV format.
+    CSV exports resumed with --after-id have no header row.
+
+    \b
+    Examples:
+        myapi export-articles --format csv --output articles.csv
+        myapi export-articles --after-id 1000 >> articles.ndjson
+    """
+
+    with open_session() as session:
+        data_manager = SyncArticleDataManager(session)
+        batches = (
+            data_manager.to_schemas(ArticleSchema, rows)
+            for rows in data_manager.stream_articles(after_id)
+        )
+        for chunk in iter_export_chunks(
+            ArticleSchema, batches, ExportFormat(export_format), header=not after_id
+        ):
+            output.write(chunk)
+
+
+@main.command()
+def refresh_article_stats() -> None:
+    """Recount articles.
+
+    Replace the article counters with counts of all articles, e.g. after
+    upgrading a database that already has articles.
+
+    \b
+    Examples:
+        myapi refresh-article-stats
+    """
+
+    with open_session() as session:
+        data_manager = SyncArticleDataManager(session)
+        data_manager.refresh_counts()
+        session.commit()
+        total = data_manager.get_total_count()
+    click.echo(f"Articles counted: {total}")
+
+
+@main.command()
+@click.argument("file", type=click.File("r"))
+@click.option(
+    "--format",
+    "import_format",
+    type=click.Choice([f.value for f in ExportFormat]),
+    help="Input format, guessed from the file extension by default",
+)
+@click.option(
+    "--group", "groups", multiple=True, help="Code of group to add users to"
+)
+@click.option(
+    "--batch-size",
+    type=int,
+    default=config.database.batch_size,
+    show_default=True,
+    help="Number of users written at once",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=config.hashing.workers,
+    show_default=True,
+    help="Number of password hashing processes",
+)
+def import_users(
+    file: TextIO,
+    import_format: str | None,
+    groups: Tuple[str, ...],
+    batch_size: int,
+    workers: int,
+) -> None:
+    """Import users.
+
+    Read users from a CSV (with name, email and password columns) or JSON
+    lines file. Users with already taken email addresses are skipped.
+
+    \b
+    Examples:
+        myapi import-users users.csv
+        myapi import-users users.jsonl --group admin
+    """
+
+    if import_format is None:
+        extension = os.path.splitext(file.name)[1].lower()
+        if extension not in EXTENSIONS:
+            raise click.BadParameter("Unknown file format, use --format")
+        import_format = EXTENSIONS[extension].value
+
+    records = read_records(file, ExportFormat(import_format))
+
+    created = skipped = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(workers) as executor, open_session() as session:
+        missing = SyncGroupDataManager(session).get_missing_groups(groups)
+        if missing:
+            raise click.BadParameter("Unknown groups: " + ", ".join(sorted(missing)))
+
+        while batch := list(islice(records, batch_size)):
+            try:
+                users = [CreateUserSchema(**record) for record in batch]
+            except ValidationError as e:
+                raise click.ClickException(
+                    f"Invalid user after {created + skipped} records: {e}"
+                )
+
+            models = import_batch(session, users, groups, executor, workers)
+            created += len(models)
+            skipped += len(users) - len(models)
+
+            rate = (created + skipped) / (time.perf_counter() - start)
+            click.echo(
+                f"Created {created}, skipped {skipped} ({rate:.0f} users/s)",
+                err=True,
+            )
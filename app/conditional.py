@@ -0,0 +1,114 @@
+import datetime
+from email.utils import (
+    format_datetime,
+    parsedate_to_datetime,
+)
+import hashlib
+from typing import (
+    Iterable,
+    Sequence,
+    Tuple,
+)
+
+from fastapi import (
+    Request,
+    Response,
+    status,
+)
+
+
+def article_etag(article_id: int, updated_at: datetime.datetime) -> str:
+    """Strong entity tag of a single article version."""
+
+    return f'"{article_id}-{updated_at.timestamp():.6f}"'
+
+
+def page_etag(
+    kind: str,
+    versions: Iterable[Tuple[int, datetime.datetime]],
+    next_cursor: str | None,
+) -> str:
+    """Strong entity tag of a page, digest of its items' versions."""
+
+    digest = hashlib.sha1(kind.encode())
+    for article_id, updated_at in versions:
+        digest.update(f"{article_id}:{updated_at.isoformat()};".encode())
+    digest.update(str(next_cursor).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def page_validators(
+    kind: str,
+    versions: Sequence[Tuple[int, datetime.datetime]],
+    next_cursor: str | None,
+) -> Tuple[str, datetime.datetime | None]:
+    """Return ``ETag`` and ``Last-Modified`` of a page."""
+
+    last_modified = max((updated_at for _, updated_at in versions), default=None)
+    return page_etag(kind, versions, next_cursor), last_modified
+
+
+def has_conditions(request: Request) -> bool:
+    """Return :obj:`True` if request carries cache validators."""
+
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: datetime.datetime | None,
+) -> bool:
+    """Evaluate ``If-None-Match`` or, if absent, ``If-Modified-Since``."""
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # weak comparison, as required for GET and HEAD
+        tags = [_opaque_tag(tag) for tag in if_none_match.split(",")]
+        return "*" in tags or _opaque_tag(etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        # "-0000" and zoneless dates are parsed naive, HTTP dates are GMT
+        since = since.replace(tzinfo=datetime.timezone.utc)
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def set_validators(
+    response: Response,
+    etag: str,
+    last_modified: datetime.datetime | None,
+) -> None:
+    """Add ``ETag`` and ``Last-Modified`` headers to response."""
+
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(
+            _as_utc(last_modified), usegmt=True
+        )
+
+
+def not_modified(etag: str, last_modified: datetime.datetime | None) -> Response:
+    """Build empty ``304 Not Modified`` response."""
+
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def _as_utc(value: datetime.datetime) -> datetime.datetime:
+    # naive timestamps are stored in server local time
+    return value.astimezone(datetime.timezone.utc)
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
@@ -24,6 +24,24 @@ TOKEN_ALGORITHM: Final = "HS256"
 ARTICLES_TAGS: Final[List[str | Enum] | None] = ["Articles"]
 ARTICLES_URL: Final = "articles"
 
+# Default and maximum number of articles returned per page
+ARTICLES_PAGE_LIMIT: Final = 50
+ARTICLES_PAGE_MAX_LIMIT: Final = 500
+
+# Maximum number of articles created or updated by a single bulk request
+ARTICLES_BULK_MAX_ITEMS: Final = 1000
+
+# Number of rows the total of all articles is spread over, so concurrent
+# writers rarely wait on the same row
+ARTICLES_TOTAL_STRIPES: Final = 16
+
+# Postgres text search configuration used to index and search articles
+ARTICLES_SEARCH_CONFIG: Final = "english"
+
+# Internal service constants
+INTERNAL_TAGS: Final[List[str | Enum] | None] = ["Internal"]
+INTERNAL_URL: Final = "internal"
+
 # DB schemas
 DEFAULT_SCHEMA: Final = "myapi"
 
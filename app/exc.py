@@ -1,17 +1,117 @@
-import inspect
+from types import TracebackType
+from typing import (
+    Dict,
+    NoReturn,
+    Type,
+)
 
+from fastapi import (
+    Request,
+    status,
+)
 from fastapi.exceptions import HTTPException
+from fastapi.responses import JSONResponse
 from loguru import logger
 
+from app.backend.log import error_sampler
 
-def raise_with_log(status_code: int, detail: str) -> None:
-    """Wrapper function for logging and raising exceptions."""
 
-    desc = f'<HTTPException status_code={status_code} detail={detail}>'
-    logger.error(f'{desc} | runner={runner_info()}')
-    raise HTTPException(status_code, detail)
+class AppException(HTTPException):
+    """Base class of exceptions turned into HTTP error responses.
 
+    Exceptions are logged by :func:`app_exception_handler` once they reach
+    the application, so raising one costs no more than a plain exception.
+    """
 
-def runner_info() -> str:
-    info = inspect.getframeinfo(inspect.stack()[2][0])
-    return f"{info.filename}:{info.function}:{info.lineno}"
+    code: int = status.HTTP_500_INTERNAL_SERVER_ERROR
+    default_detail: str = "Internal server error."
+
+    def __init__(
+        self,
+        detail: str | None = None,
+        headers: Dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(self.code, detail or self.default_detail, headers)
+
+
+class BadRequest(AppException):
+    code = status.HTTP_400_BAD_REQUEST
+    default_detail = "Bad request."
+
+
+class Unauthorized(AppException):
+    code = status.HTTP_401_UNAUTHORIZED
+    default_detail = "Unauthorized."
+
+    def __init__(
+        self,
+        detail: str | None = None,
+        headers: Dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(detail, headers or {"WWW-Authenticate": "Bearer"})
+
+
+class Forbidden(AppException):
+    code = status.HTTP_403_FORBIDDEN
+    default_detail = "Forbidden."
+
+
+class NotFound(AppException):
+    code = status.HTTP_404_NOT_FOUND
+    default_detail = "Not found."
+
+
+EXCEPTIONS: Dict[int, Type[AppException]] = {
+    exc.code: exc for exc in (BadRequest, Unauthorized, Forbidden, NotFound)
+}
+
+
+def raise_with_log(status_code: int, detail: str) -> NoReturn:
+    """Raise exception corresponding to the status code.
+
+    The exception is logged by :func:`app_exception_handler`.
+    """
+
+    exc_class = EXCEPTIONS.get(status_code)
+    if exc_class is None:
+        raise HTTPException(status_code, detail)
+    raise exc_class(detail)
+
+
+async def app_exception_handler(request: Request, exc: AppException) -> JSONResponse:
+    """Log application exception and convert it to JSON response.
+
+    Repeated errors of a route, such as invalid tokens, are sampled by
+    :data:`app.backend.log.error_sampler`.
+    """
+
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    suppressed = error_sampler.sample((route, exc.status_code, exc.detail))
+    if suppressed is not None:
+        logger.bind(
+            status_code=exc.status_code,
+            detail=exc.detail,
+            route=route,
+            runner=runner_info(exc.__traceback__),
+            suppressed=suppressed,
+        ).error("{}: {}", type(exc).__name__, exc.detail)
+
+    return JSONResponse(
+        {"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers
+    )
+
+
+def runner_info(tb: TracebackType | None) -> str:
+    """Return location the exception was raised from.
+
+    Only code objects of the traceback are inspected, no source is read.
+    Frames of this module are skipped.
+    """
+
+    location = "unknown"
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        if code.co_filename != __file__:
+            location = f"{code.co_filename}:{code.co_name}:{tb.tb_lineno}"
+        tb = tb.tb_next
+    return location
@@ -0,0 +1,103 @@
+import csv
+from enum import Enum
+import io
+import json
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    Sequence,
+    TextIO,
+    Type,
+)
+
+from app.schemas.base import BaseSchema
+
+
+class ExportFormat(str, Enum):
+    """Supported formats of exported and imported data."""
+
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES: Dict[ExportFormat, str] = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+# formats of imported files by their extension
+EXTENSIONS: Dict[str, ExportFormat] = {
+    ".csv": ExportFormat.csv,
+    ".jsonl": ExportFormat.ndjson,
+    ".ndjson": ExportFormat.ndjson,
+}
+
+
+def serialize_batch(
+        schema: Type[BaseSchema],
+        batch: Sequence[BaseSchema],
+        export_format: ExportFormat,
+        header: bool = False,
+) -> str:
+    """Serialize batch of ``schema`` instances as newline delimited JSON or
+    CSV, optionally preceded by the CSV header row."""
+
+    if export_format == ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, list(schema.model_fields))
+        if header:
+            writer.writeheader()
+        writer.writerows(item.model_dump(mode="json") for item in batch)
+        return buffer.getvalue()
+    return "".join(item.model_dump_json() + "\n" for item in batch)
+
+
+async def export_chunks(
+        schema: Type[BaseSchema],
+        batches: AsyncIterator[Sequence[BaseSchema]],
+        export_format: ExportFormat,
+        header: bool = True,
+) -> AsyncIterator[str]:
+    """Serialize batches of ``schema`` instances to the given format.
+
+    Only a single batch is held in memory at a time. Pass ``header=False``
+    to leave out the CSV header, e.g. when resuming an export.
+    """
+
+    async for batch in batches:
+        yield serialize_batch(schema, batch, export_format, header)
+        header = False
+
+    if header and (chunk := serialize_batch(schema, [], export_format, header)):
+        yield chunk
+
+
+def iter_export_chunks(
+        schema: Type[BaseSchema],
+        batches: Iterable[Sequence[BaseSchema]],
+        export_format: ExportFormat,
+        header: bool = True,
+) -> Iterator[str]:
+    """Synchronous variant of :func:`export_chunks`."""
+
+    for batch in batches:
+        yield serialize_batch(schema, batch, export_format, header)
+        header = False
+
+    if header and (chunk := serialize_batch(schema, [], export_format, header)):
+        yield chunk
+
+
+def read_records(file: TextIO, export_format: ExportFormat) -> Iterator[Dict[str, Any]]:
+    """Lazily read records from a CSV file with a header row or NDJSON file."""
+
+    if export_format == ExportFormat.csv:
+        yield from csv.DictReader(file)
+        return
+
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
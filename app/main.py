@@ -1,29 +1,74 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
-from sqlalchemy import create_engine
 
 from app.backend.config import config
+from app.backend.engine import get_async_engine
+from app.backend.jobs import job_queue
+from app.backend.log import configure_logging
+from app.backend.schema import create_schema_async
+from app.backend.session import open_async_session
 from app.const import (
     OPEN_API_DESCRIPTION,
     OPEN_API_TITLE,
 )
-from app.models.base import SQLModel
+from app.exc import (
+    app_exception_handler,
+    AppException,
+)
+from app.middleware import TimingMiddleware
 from app.routers import (
     auth,
     articles,
+    internal,
 )
+from app.services.articles import ArticleService
 from app.version import __version__
 
 
+log_sink = configure_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Application startup and shutdown hooks.
+
+    Databases without full text search are searched by an in-process
+    index held by every worker. If enabled, each worker builds its index
+    on startup, otherwise the first search served by the worker does.
+    """
+
+    if config.create_schema_on_startup:
+        await create_schema_async()
+
+    if (
+        config.build_search_index_on_startup
+        and get_async_engine().dialect.name != "postgresql"
+    ):
+        async with open_async_session() as session:
+            await ArticleService(session).build_search_index()
+
+    await job_queue.start()
+    yield
+    await job_queue.drain(config.jobs.drain_timeout)
+    log_sink.join(config.logging.flush_timeout)
+
+
 app = FastAPI(
     title=OPEN_API_TITLE,
     description=OPEN_API_DESCRIPTION,
     version=__version__,
     swagger_ui_parameters={'defaultModelsExpandDepth': -1},
+    lifespan=lifespan,
 )
 
-SQLModel.metadata.create_all(
-    create_engine(config.database.dsn)
-)
+app.add_exception_handler(AppException, app_exception_handler)
+
+if config.metrics.enabled:
+    app.add_middleware(TimingMiddleware)
 
 app.include_router(auth.router)
 app.include_router(articles.router)
+app.include_router(internal.router)
+app.include_router(internal.metrics_router)
@@ -0,0 +1,69 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from app.backend.metrics import (
+    current_metrics,
+    QueryBudget,
+    registry,
+    RequestMetrics,
+)
+
+
+class TimingMiddleware:
+    """Time requests and the SQL statements they execute.
+
+    The timings are sent in the ``Server-Timing`` response header and
+    recorded in :data:`app.backend.metrics.registry` by route template,
+    so paths with different ids share a single histogram.
+
+    SQL statements of every request are checked against the query budget
+    from :class:`app.backend.config.MetricsConfig`, if configured.
+
+    Implemented as a plain ASGI middleware, which unlike
+    ``BaseHTTPMiddleware`` adds no extra task per request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.budget = QueryBudget.from_config()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics(self.budget)
+        token = current_metrics.set(metrics)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                total = time.perf_counter() - start
+                headers.append("Server-Timing", metrics.server_timing(total))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_metrics.reset(token)
+            # route is set by the router once the path is matched
+            route = getattr(scope.get("route"), "path", "unmatched")
+            registry.observe_request(
+                scope["method"],
+                route,
+                status_code,
+                time.perf_counter() - start,
+                metrics,
+            )
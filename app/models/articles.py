@@ -1,22 +1,34 @@
 import datetime
 
 from sqlalchemy import (
-    ForeignKey, String, Text, BigInteger, DateTime
+    DDL, BigInteger, ForeignKey, String, Text, DateTime, Index, event
 )
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
 )
 
-from app.const import DEFAULT_SCHEMA
-from app.models.base import SQLModel
+from app.const import (
+    ARTICLES_SEARCH_CONFIG,
+    DEFAULT_SCHEMA,
+)
+from app.models.base import (
+    BigIntegerType,
+    SQLModel,
+)
 
 
 class ArticleModel(SQLModel):
     __tablename__ = "articles"
+    __table_args__ = (
+        # keyset pagination over (created_at, id)
+        Index("ix_articles_created_at_id", "created_at", "id"),
+        Index("ix_articles_author_id_created_at_id", "author_id", "created_at", "id"),
+        {"schema": DEFAULT_SCHEMA},
+    )
 
     id: Mapped[int] = mapped_column(
-        BigInteger, primary_key=True, autoincrement=True
+        BigIntegerType, primary_key=True, autoincrement=True
     )
     title: Mapped[str] = mapped_column(String(255))
     text: Mapped[str] = mapped_column(Text)
@@ -30,3 +42,49 @@ class ArticleModel(SQLModel):
     updated_at: Mapped[datetime.datetime] = mapped_column(
         DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now,
     )
+
+
+class ArticleCountModel(SQLModel):
+    """Number of articles by author, maintained by article writes."""
+
+    __tablename__ = "article_counts"
+
+    author_id: Mapped[int] = mapped_column(
+        BigIntegerType, primary_key=True, autoincrement=False
+    )
+    count: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+class ArticleTotalModel(SQLModel):
+    """Number of all articles, striped over a few rows.
+
+    Every write adds to one of :data:`app.const.ARTICLES_TOTAL_STRIPES`
+    rows, the total is their sum.
+    """
+
+    __tablename__ = "article_totals"
+
+    stripe: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    count: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+# Postgres only generated column with the full text search vector of title
+# and text, and its GIN index. The statements are idempotent and run on
+# every schema creation, so existing tables get the column as well.
+SEARCH_DDL = [
+    DDL(  # type: ignore[no-untyped-call]
+        f"ALTER TABLE {DEFAULT_SCHEMA}.articles "
+        "ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS "
+        f"(to_tsvector('{ARTICLES_SEARCH_CONFIG}', "
+        "coalesce(title, '') || ' ' || coalesce(text, ''))) STORED"
+    ),
+    DDL(  # type: ignore[no-untyped-call]
+        "CREATE INDEX IF NOT EXISTS ix_articles_search_vector "
+        f"ON {DEFAULT_SCHEMA}.articles USING gin (search_vector)"
+    ),
+]
+
+for ddl in SEARCH_DDL:
+    event.listen(
+        SQLModel.metadata, "after_create", ddl.execute_if(dialect="postgresql")
+    )
@@ -2,7 +2,7 @@ import datetime
 from typing import List
 
 from sqlalchemy import (
-    ForeignKey, String, BigInteger, DateTime
+    ForeignKey, String, DateTime
 )
 from sqlalchemy.orm import (
     Mapped,
@@ -10,7 +10,10 @@ from sqlalchemy.orm import (
 )
 
 from app.const import DEFAULT_SCHEMA
-from app.models.base import SQLModel
+from app.models.base import (
+    BigIntegerType,
+    SQLModel,
+)
 
 
 class GroupModel(SQLModel):
@@ -18,20 +21,25 @@ class GroupModel(SQLModel):
 
     code: Mapped[str] = mapped_column(String(31), primary_key=True)
     name: Mapped[str] = mapped_column(String(127))
-    users: Mapped[List["GroupUserModel"]] = relationship("GroupUserModel")
+    # lazy loads are refused, choose a loader strategy per query instead
+    users: Mapped[List["GroupUserModel"]] = relationship(
+        "GroupUserModel", lazy="raise_on_sql"
+    )
 
 
 class UserModel(SQLModel):
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(
-        BigInteger, primary_key=True, autoincrement=True
+        BigIntegerType, primary_key=True, autoincrement=True
     )
     email: Mapped[str] = mapped_column(String(255), unique=True)
     name: Mapped[str] = mapped_column(String(127))
     password: Mapped[str] = mapped_column(String(255))
 
-    groups: Mapped[List["GroupUserModel"]] = relationship("GroupUserModel")
+    groups: Mapped[List["GroupUserModel"]] = relationship(
+        "GroupUserModel", lazy="raise_on_sql"
+    )
 
 
 class GroupUserModel(SQLModel):
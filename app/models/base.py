@@ -4,11 +4,19 @@ from typing import (
     List,
 )
 
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from app.const import DEFAULT_SCHEMA
 
 
+# SQLite only autoincrements primary keys declared as INTEGER
+BigIntegerType = BigInteger().with_variant(Integer(), "sqlite")
+
+
 class SQLModel(DeclarativeBase):
     """Base class used for model definitions.
 
@@ -16,7 +24,7 @@ class SQLModel(DeclarativeBase):
     to the corresponding schema.
     """
 
-    __table_args__ = {"schema": DEFAULT_SCHEMA}
+    __table_args__: Any = {"schema": DEFAULT_SCHEMA}
 
     @classmethod
     def schema(cls) -> str:
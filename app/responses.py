@@ -0,0 +1,63 @@
+from typing import (
+    Any,
+    TypeVar,
+)
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.backend.config import config
+
+
+T = TypeVar("T")
+
+# serializes schemas, lists of schemas and plain JSON values alike
+_adapter: TypeAdapter[Any] = TypeAdapter(Any)
+
+
+class FastJSONResponse(Response):
+    """JSON response serialized by pydantic-core in a single pass.
+
+    Returning it from an endpoint skips FastAPI's validation of the
+    result against ``response_model`` and its :func:`jsonable_encoder`
+    walk, the schemas are written to JSON bytes directly. Declare
+    ``response_model`` anyway to keep the OpenAPI documentation.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return _adapter.dump_json(content)
+
+
+def json_response(
+    content: Any,
+    response: Response | None = None,
+    status_code: int = 200,
+) -> FastJSONResponse:
+    """Build fast JSON response of the endpoint.
+
+    Headers and cookies set on the ``response`` parameter of the endpoint,
+    e.g. by its dependencies, are copied to the returned response.
+    """
+
+    fast = FastJSONResponse(content, status_code=status_code)
+    if response is not None:
+        fast.raw_headers += [
+            header for header in response.raw_headers if header[0] != b"content-length"
+        ]
+    return fast
+
+
+def respond(content: T, response: Response) -> T | FastJSONResponse:
+    """Return endpoint result, as fast JSON response if enabled.
+
+    By default the result is returned as is, validated and serialized
+    by FastAPI against the ``response_model`` of the endpoint.
+    """
+
+    if not config.fast_json_responses:
+        return content
+    return json_response(content, response)
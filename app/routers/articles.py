@@ -1,55 +1,275 @@
-from typing import List
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Union,
+)
 
 from fastapi import (
     APIRouter,
+    Body,
     Depends,
+    Query,
+    Request,
+    Response,
+    status,
 )
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.backend.session import create_session
+from app.backend.session import (
+    create_read_session,
+    create_write_session,
+    open_read_session,
+)
+from app.conditional import (
+    article_etag,
+    has_conditions,
+    is_not_modified,
+    not_modified,
+    page_validators,
+    set_validators,
+)
 from app.const import (
+    ARTICLES_BULK_MAX_ITEMS,
+    ARTICLES_PAGE_LIMIT,
+    ARTICLES_PAGE_MAX_LIMIT,
     ARTICLES_TAGS,
     ARTICLES_URL,
 )
+from app.export import (
+    export_chunks,
+    ExportFormat,
+    MEDIA_TYPES,
+)
+from app.responses import respond
 from app.schemas.auth import UserSchema
 from app.schemas.articles import ArticleSchema, ArticleCreateSchema, \
-    ArticleUpdateSchema
+    ArticleUpdateSchema, ArticleFilterSchema, ArticlePageSchema, \
+    ArticleSummaryPageSchema, ArticleBulkUpdateSchema, ArticleBulkResultSchema, \
+    ArticleStatsSchema, AuthorStatsPageSchema
 from app.services.auth import get_current_user
 from app.services.articles import ArticleService
 
 
 router = APIRouter(prefix="/" + ARTICLES_URL, tags=ARTICLES_TAGS)
 
+NOT_MODIFIED: Dict[Union[int, str], Dict[str, Any]] = {
+    status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}
+}
+
 
-@router.get("/", response_model=List[ArticleSchema])
+@router.get("/", response_model=ArticlePageSchema, responses=NOT_MODIFIED)
 async def get_articles(
-    session: Session = Depends(create_session),
-) -> List[ArticleSchema]:
-    """Get articles."""
+    request: Request,
+    response: Response,
+    limit: int = Query(ARTICLES_PAGE_LIMIT, ge=1, le=ARTICLES_PAGE_MAX_LIMIT),
+    cursor: str | None = None,
+    filters: ArticleFilterSchema = Depends(),
+    session: AsyncSession = Depends(create_read_session),
+) -> ArticlePageSchema | Response:
+    """Get page of articles, newest first.
+
+    Pass ``next_cursor`` of the response as ``cursor`` to get the next page.
+    Supports conditional requests using the page ``ETag``.
+    """
+
+    service = ArticleService(session)
+    if has_conditions(request):
+        versions, next_cursor = await service.get_page_versions(
+            limit, cursor, filters
+        )
+        etag, last_modified = page_validators("page", versions, next_cursor)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+
+    page = await service.get_articles(limit, cursor, filters)
+    versions = [(item.id, item.updated_at) for item in page.items]
+    set_validators(response, *page_validators("page", versions, page.next_cursor))
+    return respond(page, response)
+
+
+@router.get(
+    "/summary", response_model=ArticleSummaryPageSchema, responses=NOT_MODIFIED
+)
+async def get_article_summaries(
+    request: Request,
+    response: Response,
+    limit: int = Query(ARTICLES_PAGE_LIMIT, ge=1, le=ARTICLES_PAGE_MAX_LIMIT),
+    cursor: str | None = None,
+    filters: ArticleFilterSchema = Depends(),
+    session: AsyncSession = Depends(create_read_session),
+) -> ArticleSummaryPageSchema | Response:
+    """Get page of articles without their text, newest first.
+
+    Paginated and validated the same way as the full list of articles.
+    """
+
+    service = ArticleService(session)
+    if has_conditions(request):
+        versions, next_cursor = await service.get_page_versions(
+            limit, cursor, filters
+        )
+        etag, last_modified = page_validators("summary", versions, next_cursor)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+
+    page = await service.get_article_summaries(limit, cursor, filters)
+    versions = [(item.id, item.updated_at) for item in page.items]
+    set_validators(response, *page_validators("summary", versions, page.next_cursor))
+    return respond(page, response)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_articles(
+    format: ExportFormat = ExportFormat.ndjson,
+    after_id: int = Query(0, ge=0),
+) -> StreamingResponse:
+    """Export all articles ordered by id as NDJSON or CSV.
+
+    Articles are streamed from the database, so the memory used does not
+    depend on the number of articles. Pass id of the last received
+    article as ``after_id`` to resume an interrupted export; resumed CSV
+    exports have no header row, so they can be appended to the first part.
+    """
+
+    async def content() -> AsyncIterator[str]:
+        # the session is bound to the response body, not to the endpoint
+        async with open_read_session() as session:
+            batches = ArticleService(session).export_articles(after_id)
+            chunks = export_chunks(
+                ArticleSchema, batches, format, header=not after_id
+            )
+            async for chunk in chunks:
+                yield chunk
+
+    filename = f"articles.{format.value}"
+    return StreamingResponse(
+        content(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/search", response_model=ArticlePageSchema)
+async def search_articles(
+    response: Response,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(ARTICLES_PAGE_LIMIT, ge=1, le=ARTICLES_PAGE_MAX_LIMIT),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(create_read_session),
+) -> ArticlePageSchema | Response:
+    """Search articles by title and text, best match first.
+
+    Supports web search syntax on Postgres, e.g. quoted phrases, ``or``
+    and ``-`` to exclude words. Paginated using ``next_cursor``.
+    """
 
-    return ArticleService(session).get_articles()
+    page = await ArticleService(session).search_articles(q, limit, cursor)
+    return respond(page, response)
 
 
-@router.get("/{id}", response_model=ArticleSchema)
+@router.get("/stats", response_model=ArticleStatsSchema)
+async def get_article_stats(
+    session: AsyncSession = Depends(create_read_session),
+) -> ArticleStatsSchema:
+    """Get number of all articles.
+
+    Read from a counter maintained by article writes, not by counting.
+    """
+
+    return await ArticleService(session).get_stats()
+
+
+@router.get("/stats/authors", response_model=AuthorStatsPageSchema)
+async def get_author_stats(
+    limit: int = Query(ARTICLES_PAGE_LIMIT, ge=1, le=ARTICLES_PAGE_MAX_LIMIT),
+    cursor: str | None = None,
+    author_id: List[int] = Query([]),
+    session: AsyncSession = Depends(create_read_session),
+) -> AuthorStatsPageSchema:
+    """Get page of article counts by author, ordered by author id.
+
+    Pass ``author_id`` one or more times to get counts of those authors.
+    """
+
+    return await ArticleService(session).get_author_stats(limit, cursor, author_id)
+
+
+@router.get("/{id}", response_model=ArticleSchema, responses=NOT_MODIFIED)
 async def get_article(
     id: int,
-    session: Session = Depends(create_session),
-) -> ArticleSchema:
-    """Get article by id."""
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(create_read_session),
+) -> ArticleSchema | Response:
+    """Get article by id.
+
+    Supports conditional requests, answered from the article version only.
+    """
+
+    service = ArticleService(session)
+    if has_conditions(request):
+        updated_at = await service.get_article_version(id)
+        etag = article_etag(id, updated_at)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at)
 
-    return ArticleService(session).get_article(id)
+    article = await service.get_article(id)
+    set_validators(
+        response, article_etag(article.id, article.updated_at), article.updated_at
+    )
+    return respond(article, response)
 
 
 @router.post("/", response_model=ArticleSchema)
 async def post_article(
     item: ArticleCreateSchema,
     user: UserSchema = Depends(get_current_user),
-    session: Session = Depends(create_session),
+    session: AsyncSession = Depends(create_write_session),
 ) -> ArticleSchema:
     """Create article."""
 
-    model = ArticleService(session).create_article(item, user.id)
-    return ArticleService(session).get_article(model.id)
+    return await ArticleService(session).create_article(item, user.id)
+
+
+@router.post("/bulk", response_model=List[ArticleBulkResultSchema])
+async def post_articles(
+    response: Response,
+    items: List[ArticleCreateSchema] = Body(
+        ..., min_length=1, max_length=ARTICLES_BULK_MAX_ITEMS
+    ),
+    user: UserSchema = Depends(get_current_user),
+    session: AsyncSession = Depends(create_write_session),
+) -> List[ArticleBulkResultSchema] | Response:
+    """Create articles in a single transaction.
+
+    Results are returned in the order of the request items.
+    """
+
+    results = await ArticleService(session).create_articles(items, user.id)
+    return respond(results, response)
+
+
+@router.put("/bulk", response_model=List[ArticleBulkResultSchema])
+async def update_articles(
+    response: Response,
+    items: List[ArticleBulkUpdateSchema] = Body(
+        ..., min_length=1, max_length=ARTICLES_BULK_MAX_ITEMS
+    ),
+    user: UserSchema = Depends(get_current_user),
+    session: AsyncSession = Depends(create_write_session),
+) -> List[ArticleBulkResultSchema] | Response:
+    """Update articles in a single transaction.
+
+    Results are returned in the order of the request items, each with
+    its own status code. Articles that are missing or the user is not
+    allowed to edit are skipped.
+    """
+
+    results = await ArticleService(session).update_articles(items, user)
+    return respond(results, response)
 
 
 @router.put("/{id}", response_model=ArticleSchema)
@@ -57,12 +277,14 @@ async def update_article(
     id: int,
     item: ArticleUpdateSchema,
     user: UserSchema = Depends(get_current_user),
-    session: Session = Depends(create_session),
+    session: AsyncSession = Depends(create_write_session),
 ) -> ArticleSchema:
-    """Update article."""
+    """Update article.
+
+    Raises:
+        HTTPException: 400 Bad request
+            - The user is neither the author nor an admin
+        HTTPException: 404 Not Found
+    """
 
-    model = ArticleService(session).get_article_model(id)
-    ArticleService(session).check_obj_exists_or_raise(model)
-    ArticleService(session).check_has_permissions_to_edit(model, user)
-    ArticleService(session).update_article(model, item)
-    return ArticleService(session).get_article(model.id)
+    return await ArticleService(session).update_article(id, item, user)
@@ -4,9 +4,9 @@ from fastapi import (
     status,
 )
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.backend.session import create_session
+from app.backend.session import create_async_session
 from app.const import (
     AUTH_TAGS,
     AUTH_URL, AUTH_REG_URL,
@@ -21,7 +21,7 @@ router = APIRouter(prefix="", tags=AUTH_TAGS)
 @router.post("/" + AUTH_URL, response_model=TokenSchema)
 async def authenticate(
     login: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(create_session),
+    session: AsyncSession = Depends(create_async_session),
 ) -> TokenSchema | None:
     """User authentication.
 
@@ -33,13 +33,13 @@ async def authenticate(
         Access token.
     """
 
-    return AuthService(session).authenticate(login)
+    return await AuthService(session).authenticate(login)
 
 
 @router.post("/" + AUTH_REG_URL, status_code=status.HTTP_201_CREATED)
 async def registration(
     item: CreateUserSchema,
-    session: Session = Depends(create_session),
+    session: AsyncSession = Depends(create_async_session),
 ) -> UserSchema:
     """User registration.
 
@@ -48,5 +48,6 @@ async def registration(
             - The user with specified email address already exists
     """
 
-    model = AuthService(session).create_user(item)
-    return AuthService(session).get_user(model.email)
+    service = AuthService(session)
+    model = await service.create_user(item)
+    return service.to_schema(UserSchema, model)
@@ -0,0 +1,80 @@
+from typing import List
+
+from fastapi import (
+    APIRouter,
+    Depends,
+)
+from fastapi.responses import PlainTextResponse
+
+from app.backend.cache import get_cache
+from app.backend.config import config
+from app.backend.engine import all_pool_stats
+from app.backend.metrics import registry
+from app.backend.session import open_async_session
+from app.const import (
+    INTERNAL_TAGS,
+    INTERNAL_URL,
+)
+from app.exc import Forbidden
+from app.schemas.internal import (
+    CacheStatsSchema,
+    PoolStatsSchema,
+)
+from app.services.auth import (
+    AuthService,
+    get_current_user,
+    oauth2_schema,
+)
+
+
+async def check_access(token: str | None = Depends(oauth2_schema)) -> None:
+    """Allow only admins unless the endpoints are configured public.
+
+    The endpoints expose database DSNs and pool and cache statistics,
+    see :attr:`app.backend.config.MetricsConfig.public_endpoints`.
+    """
+
+    if config.metrics.public_endpoints:
+        return
+
+    user = await get_current_user(token)
+    async with open_async_session() as session:
+        if user is None or not await AuthService(session).is_admin(user):
+            raise Forbidden("Admin access required")
+
+
+router = APIRouter(
+    prefix="/" + INTERNAL_URL, tags=INTERNAL_TAGS, dependencies=[Depends(check_access)]
+)
+
+# scraped by Prometheus from its conventional path
+metrics_router = APIRouter(tags=INTERNAL_TAGS, dependencies=[Depends(check_access)])
+
+
+@router.get("/pool", response_model=List[PoolStatsSchema])
+async def get_pool_stats() -> List[PoolStatsSchema]:
+    """Get connection pool metrics of every database engine.
+
+    Wait times are reported in seconds.
+    """
+
+    return [PoolStatsSchema(**stats) for stats in all_pool_stats()]
+
+
+@router.get("/cache", response_model=CacheStatsSchema)
+async def get_cache_stats() -> CacheStatsSchema:
+    """Get response cache counters."""
+
+    cache = get_cache()
+    return CacheStatsSchema(
+        backend=type(cache).__name__,
+        size=cache.size(),
+        **cache.stats.as_dict(),
+    )
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> str:
+    """Get request and SQL metrics in the Prometheus text format."""
+
+    return registry.render()
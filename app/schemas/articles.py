@@ -1,10 +1,26 @@
-from app.schemas.base import BaseSchema
+import datetime
+
+from app.schemas.base import (
+    BaseSchema,
+    PageSchema,
+)
 
 
 class ArticleSchema(BaseSchema):
     id: int
     title: str
     text: str
+    author_id: int
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+
+
+class ArticleSummarySchema(BaseSchema):
+    id: int
+    title: str
+    author_id: int
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
 
 
 class ArticleCreateSchema(BaseSchema):
@@ -15,3 +31,43 @@ class ArticleCreateSchema(BaseSchema):
 class ArticleUpdateSchema(BaseSchema):
     title: str
     text: str
+
+
+class ArticleBulkUpdateSchema(ArticleUpdateSchema):
+    id: int
+
+
+class ArticleBulkResultSchema(BaseSchema):
+    """Result of a single item of a bulk request."""
+
+    id: int
+    status: int
+    detail: str | None = None
+    article: ArticleSchema | None = None
+
+
+class ArticleFilterSchema(BaseSchema):
+    author_id: int | None = None
+    created_from: datetime.datetime | None = None
+    created_to: datetime.datetime | None = None
+
+
+class ArticleStatsSchema(BaseSchema):
+    total: int
+
+
+class AuthorStatsSchema(BaseSchema):
+    author_id: int
+    count: int
+
+
+class ArticlePageSchema(PageSchema[ArticleSchema]):
+    pass
+
+
+class ArticleSummaryPageSchema(PageSchema[ArticleSummarySchema]):
+    pass
+
+
+class AuthorStatsPageSchema(PageSchema[AuthorStatsSchema]):
+    pass
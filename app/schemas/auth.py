@@ -1,3 +1,5 @@
+from typing import FrozenSet
+
 from app.schemas.base import BaseSchema
 
 
@@ -13,6 +15,10 @@ class UserSchema(BaseSchema):
     email: str
 
 
+class CurrentUserSchema(UserSchema):
+    groups: FrozenSet[str] = frozenset()
+
+
 class AuthUserSchema(BaseSchema):
     id: int
     name: str
@@ -1,8 +1,22 @@
+from typing import (
+    Generic,
+    List,
+    TypeVar,
+)
+
 from pydantic import (
     BaseModel,
     ConfigDict,
 )
 
 
+T = TypeVar("T")
+
+
 class BaseSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
+
+
+class PageSchema(BaseSchema, Generic[T]):
+    items: List[T]
+    next_cursor: str | None = None
@@ -0,0 +1,22 @@
+from app.schemas.base import BaseSchema
+
+
+class PoolStatsSchema(BaseSchema):
+    name: str
+    pool_class: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    wait_count: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+class CacheStatsSchema(BaseSchema):
+    backend: str
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
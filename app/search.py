@@ -0,0 +1,106 @@
+from collections import Counter
+import re
+from typing import (
+    Dict,
+    List,
+    Tuple,
+)
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """In-process full text index of documents identified by integer ids.
+
+    Used to search articles when the database has no full text search.
+    Documents match if they contain every query token and are ranked by
+    the number of occurrences of the query tokens.
+
+    While the index is built from a database snapshot, documents written
+    meanwhile are kept aside by :meth:`update` and applied over the
+    snapshot by :meth:`finish_build`, so no write is lost.
+    """
+
+    def __init__(self) -> None:
+        self.loaded = False
+        self.building = False
+        self._postings: Dict[str, Dict[int, int]] = dict()
+        self._documents: Dict[int, Counter[str]] = dict()
+        self._pending: Dict[int, Tuple[str, ...]] = dict()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: int, *texts: str) -> None:
+        """Index document, replacing its previous version."""
+
+        self.remove(doc_id)
+        counts = Counter(token for text in texts for token in tokenize(text))
+        for token, count in counts.items():
+            self._postings.setdefault(token, dict())[doc_id] = count
+        self._documents[doc_id] = counts
+
+    def update(self, doc_id: int, *texts: str) -> None:
+        """Index written document once the index is built or being built."""
+
+        if self.building:
+            self._pending[doc_id] = texts
+        elif self.loaded:
+            self.add(doc_id, *texts)
+
+    def begin_build(self) -> None:
+        """Start building the index from scratch by :meth:`add`."""
+
+        self.clear()
+        self.building = True
+
+    def finish_build(self) -> None:
+        """Apply documents written during the build and mark index loaded."""
+
+        for doc_id, texts in self._pending.items():
+            self.add(doc_id, *texts)
+        self._pending.clear()
+        self.building = False
+        self.loaded = True
+
+    def remove(self, doc_id: int) -> None:
+        for token in self._documents.pop(doc_id, ()):
+            postings = self._postings[token]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[token]
+
+    def search(self, query: str) -> List[Tuple[float, int]]:
+        """Return ``(rank, id)`` of matching documents, best match first."""
+
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+
+        postings = sorted(
+            (self._postings.get(token, dict()) for token in tokens), key=len
+        )
+        matches = set(postings[0]).intersection(*postings[1:])
+        ranked = [
+            (float(sum(posting[doc_id] for posting in postings)), doc_id)
+            for doc_id in matches
+        ]
+        return sorted(ranked, reverse=True)
+
+    def clear(self) -> None:
+        self.loaded = False
+        self.building = False
+        self._postings.clear()
+        self._documents.clear()
+        self._pending.clear()
+
+
+# fallback index of article titles and texts
+article_index = InvertedIndex()
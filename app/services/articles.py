@@ -1,93 +1,846 @@
-from typing import List
-
-from fastapi import (
-    status,
+import asyncio
+import datetime
+import random
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
 )
 
-from sqlalchemy import select
+from fastapi import status
+from loguru import logger
+from sqlalchemy import (
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    Select,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import (
+    REGCONFIG,
+    TSVECTOR,
+)
+from sqlalchemy.sql.expression import Executable
 
-from app.exc import raise_with_log
-from app.models.articles import ArticleModel
+from app.backend.cache import (
+    CacheBackend,
+    get_cache,
+    NullCacheBackend,
+)
+from app.backend.config import config
+from app.backend.jobs import job_queue
+from app.backend.session import USE_CACHE
+from app.const import (
+    ARTICLES_SEARCH_CONFIG,
+    ARTICLES_TOTAL_STRIPES,
+)
+from app.exc import (
+    BadRequest,
+    NotFound,
+)
+from app.models.articles import (
+    ArticleCountModel,
+    ArticleModel,
+    ArticleTotalModel,
+)
 from app.schemas.articles import ArticleSchema, ArticleCreateSchema, \
-    ArticleUpdateSchema
+    ArticleUpdateSchema, ArticleFilterSchema, ArticlePageSchema, \
+    ArticleSummarySchema, ArticleSummaryPageSchema, ArticleBulkUpdateSchema, \
+    ArticleBulkResultSchema, ArticleStatsSchema, AuthorStatsSchema, \
+    AuthorStatsPageSchema
 from app.schemas.auth import UserSchema
+from app.search import article_index
 from app.services.auth import AuthService
 from app.services.base import (
+    AsyncBaseDataManager,
     BaseDataManager,
     BaseService,
+    decode_cursor,
+    encode_cursor,
 )
 
 
+T = TypeVar("T")
+
+# a single build of the fallback search index at a time
+search_index_lock = asyncio.Lock()
+
+
+@job_queue.job("articles.index")
+async def index_articles(articles: Sequence[Tuple[int, str, str]]) -> None:
+    """Add ``(id, title, text)`` of written articles to the fallback index."""
+
+    for article_id, title, text in articles:
+        article_index.update(article_id, title, text)
+
+
+@job_queue.job("articles.created")
+async def articles_created(article_ids: Sequence[int], author_id: int) -> None:
+    """Announce new articles, the place for future notifications."""
+
+    logger.info("Articles {} created by user {}", article_ids, author_id)
+
+
+class ArticleCache:
+    """Cache keys and invalidation of article reads.
+
+    Pages are cached under a generation number that is bumped by every
+    write, so a stale page is never served and old ones age out.
+    Articles are cached under a version of their own, bumped only by
+    writes of the article. A value read before a write but stored after
+    it lands under the previous generation or version, where it is never
+    looked up again.
+    """
+
+    GENERATION_KEY = "articles:generation"
+
+    def __init__(self, cache: CacheBackend) -> None:
+        self.cache = cache
+
+    @staticmethod
+    def version_key(article_id: int) -> str:
+        return f"articles:version:{article_id}"
+
+    async def article_key(self, article_id: int) -> str:
+        version = await self.cache.counter(self.version_key(article_id))
+        return f"articles:item:{article_id}:{version}"
+
+    async def page_key(
+            self,
+            kind: str,
+            limit: int,
+            cursor: str | None,
+            filters: ArticleFilterSchema,
+    ) -> str:
+        generation = await self.cache.counter(self.GENERATION_KEY)
+        return (
+            f"articles:{kind}:{generation}:{limit}:{cursor}:"
+            f"{filters.model_dump_json()}"
+        )
+
+    async def get_or_set(
+            self, key: str, factory: Callable[[], Awaitable[T]], type_: Any
+    ) -> T:
+        return await self.cache.get_or_set(key, factory, type_)
+
+    async def invalidate(self, *article_ids: int) -> None:
+        """Drop cached pages and, if given, the cached articles."""
+
+        for article_id in article_ids:
+            await self.cache.incr(self.version_key(article_id))
+        await self.cache.incr(self.GENERATION_KEY)
+
+
 class ArticleService(BaseService):
-    def get_article(self, article_id: int) -> ArticleSchema:
-        return ArticleDataManager(self.session).get_article(article_id)
+    @property
+    def cache(self) -> ArticleCache:
+        if not self.session.info.get(USE_CACHE, True):
+            return ArticleCache(NullCacheBackend(0))
+        return ArticleCache(get_cache())
+
+    async def get_article(self, article_id: int) -> ArticleSchema:
+        return await self.cache.get_or_set(
+            await self.cache.article_key(article_id),
+            lambda: ArticleDataManager(self.session).get_article(article_id),
+            ArticleSchema,
+        )
+
+    async def get_article_model(self, article_id: int) -> ArticleModel:
+        return await ArticleDataManager(self.session).get_article_model(article_id)
+
+    async def get_article_version(self, article_id: int) -> datetime.datetime:
+        version = await ArticleDataManager(self.session).get_article_version(
+            article_id
+        )
+        if version is None:
+            raise NotFound("Article not found.")
+        return version
+
+    async def get_page_versions(
+            self,
+            limit: int,
+            cursor: str | None = None,
+            filters: ArticleFilterSchema | None = None,
+    ) -> Tuple[List[Tuple[int, datetime.datetime]], str | None]:
+        return await ArticleDataManager(self.session).get_page_versions(
+            limit, self._decode_position(cursor), filters or ArticleFilterSchema()
+        )
+
+    async def get_articles(
+            self,
+            limit: int,
+            cursor: str | None = None,
+            filters: ArticleFilterSchema | None = None,
+    ) -> ArticlePageSchema:
+        filters = filters or ArticleFilterSchema()
+        position = self._decode_position(cursor)
+        return await self.cache.get_or_set(
+            await self.cache.page_key("page", limit, cursor, filters),
+            lambda: ArticleDataManager(self.session).get_articles(
+                limit, position, filters
+            ),
+            ArticlePageSchema,
+        )
+
+    async def get_article_summaries(
+            self,
+            limit: int,
+            cursor: str | None = None,
+            filters: ArticleFilterSchema | None = None,
+    ) -> ArticleSummaryPageSchema:
+        filters = filters or ArticleFilterSchema()
+        position = self._decode_position(cursor)
+        return await self.cache.get_or_set(
+            await self.cache.page_key("summary", limit, cursor, filters),
+            lambda: ArticleDataManager(self.session).get_article_summaries(
+                limit, position, filters
+            ),
+            ArticleSummaryPageSchema,
+        )
 
-    def get_article_model(self, article_id: int) -> ArticleModel:
-        return ArticleDataManager(self.session).get_article_model(article_id)
+    async def search_articles(
+            self,
+            query: str,
+            limit: int,
+            cursor: str | None = None,
+    ) -> ArticlePageSchema:
+        """Search articles by title and text, best match first.
+
+        Postgres searches the GIN indexed ``search_vector`` column, other
+        databases fall back to the in-process
+        :data:`app.search.article_index` of the worker, built on startup
+        or by the first search.
+        """
+
+        data_manager = ArticleDataManager(self.session)
+        position = self._decode_rank_position(cursor)
+        if data_manager.has_full_text_search():
+            return await data_manager.search_articles(query, limit, position)
 
-    def get_articles(self) -> List[ArticleSchema]:
-        return ArticleDataManager(self.session).get_articles()
+        if not article_index.loaded:
+            await self.build_search_index()
+
+        ranked = article_index.search(query)
+        if position is not None:
+            ranked = [item for item in ranked if item < position]
+        ranked = ranked[:limit + 1]
+
+        models = await data_manager.get_articles_by_ids(
+            [article_id for _, article_id in ranked[:limit]]
+        )
+        order = {article_id: i for i, (_, article_id) in enumerate(ranked)}
+        models.sort(key=lambda model: order[model.id])
 
-    def create_article(
+        next_cursor = None
+        if len(ranked) > limit:
+            next_cursor = encode_cursor(*ranked[limit - 1])
+        return ArticlePageSchema(
+            items=self.to_schemas(ArticleSchema, models), next_cursor=next_cursor
+        )
+
+    async def create_article(
             self,
             item: ArticleCreateSchema,
             author_id: int,
-    ) -> ArticleModel:
+    ) -> ArticleSchema:
+        """Insert article and return it without reading it back."""
 
         model = ArticleModel(
             title=item.title,
             text=item.text,
             author_id=author_id,
         )
-        ArticleDataManager(self.session).add_one(model)
-        return model
+        data_manager = ArticleDataManager(self.session)
+        await data_manager.add_one(model)
+        await data_manager.increment_counts({author_id: 1})
+        await self.session.commit()
+        await self.cache.invalidate()
+        await self._index_articles([model])
+        await job_queue.enqueue(
+            "articles.created", article_ids=[model.id], author_id=author_id
+        )
+        return self.to_schema(ArticleSchema, model)
+
+    async def update_article(
+            self,
+            article_id: int,
+            item: ArticleUpdateSchema,
+            user: UserSchema,
+    ) -> ArticleSchema:
+        """Update article if the user is its author or an admin.
+
+        The author check is part of the ``UPDATE ... RETURNING`` statement,
+        so a permitted update takes a single round trip. The reason of
+        a failed update is looked up afterwards.
+        """
+
+        data_manager = ArticleDataManager(self.session)
+
+        model = await data_manager.update_article(article_id, item, author_id=user.id)
+        if model is None and await AuthService(self.session).is_admin(user):
+            model = await data_manager.update_article(article_id, item)
+
+        if model is None:
+            if await data_manager.get_article_version(article_id) is None:
+                raise NotFound("Article not found.")
+            raise BadRequest("You don't have permissions to edit this article.")
 
-    def update_article(self, model: ArticleModel, item: ArticleUpdateSchema):
-        ArticleDataManager(self.session).update_one(model, item)
+        await self.session.commit()
+        await self.cache.invalidate(article_id)
+        await self._index_articles([model])
+        return self.to_schema(ArticleSchema, model)
 
-    def check_obj_exists_or_raise(
+    async def create_articles(
             self,
-            model: ArticleModel,
-            status_code: int = status.HTTP_404_NOT_FOUND,
-            message: str = "Not found."
-    ):
-        if not isinstance(model, ArticleModel):
-            raise_with_log(status_code, message)
+            items: Sequence[ArticleCreateSchema],
+            author_id: int,
+    ) -> List[ArticleBulkResultSchema]:
+        """Insert articles in batches within a single transaction."""
+
+        data_manager = ArticleDataManager(self.session)
+        models = await data_manager.add_articles(items, author_id)
+        await data_manager.increment_counts({author_id: len(models)})
+        await self.session.commit()
+        await self.cache.invalidate()
+        await self._index_articles(models)
+        await job_queue.enqueue(
+            "articles.created",
+            article_ids=[model.id for model in models],
+            author_id=author_id,
+        )
 
-    def check_has_permissions_to_edit(
+        articles = self.to_schemas(ArticleSchema, models)
+        return [
+            ArticleBulkResultSchema(
+                id=article.id, status=status.HTTP_201_CREATED, article=article
+            )
+            for article in articles
+        ]
+
+    async def update_articles(
             self,
-            model: ArticleModel,
+            items: Sequence[ArticleBulkUpdateSchema],
             user: UserSchema,
-    ):
-        if model.created_at == user.id:
-            return True
-        if AuthService(self.session).is_admin(user):
-            return True
-        raise raise_with_log(
-            status.HTTP_400_BAD_REQUEST,
-            "You don't have permissions to edit this article."
+    ) -> List[ArticleBulkResultSchema]:
+        """Update articles the user is allowed to edit.
+
+        Authors of all articles are read by a single query and permitted
+        updates are sent in batches within a single transaction. Items
+        that cannot be updated are reported in the result, they do not
+        fail the whole request.
+        """
+
+        data_manager = ArticleDataManager(self.session)
+        authors = await data_manager.get_article_authors({item.id for item in items})
+
+        is_admin = False
+        if any(authors.get(item.id, user.id) != user.id for item in items):
+            is_admin = await AuthService(self.session).is_admin(user)
+
+        errors: Dict[int, ArticleBulkResultSchema] = dict()
+        permitted: List[ArticleBulkUpdateSchema] = []
+        for item in items:
+            if item.id not in authors:
+                errors[item.id] = ArticleBulkResultSchema(
+                    id=item.id,
+                    status=status.HTTP_404_NOT_FOUND,
+                    detail="Article not found.",
+                )
+            elif authors[item.id] != user.id and not is_admin:
+                errors[item.id] = ArticleBulkResultSchema(
+                    id=item.id,
+                    status=status.HTTP_400_BAD_REQUEST,
+                    detail="You don't have permissions to edit this article.",
+                )
+            else:
+                permitted.append(item)
+
+        articles: Dict[int, ArticleSchema] = dict()
+        if permitted:
+            ids = {item.id for item in permitted}
+            await data_manager.update_articles(permitted)
+            models = await data_manager.get_articles_by_ids(ids)
+            await self.session.commit()
+            await self.cache.invalidate(*ids)
+            await self._index_articles(models)
+            articles = {
+                article.id: article
+                for article in self.to_schemas(ArticleSchema, models)
+            }
+
+        return [
+            errors.get(item.id) or ArticleBulkResultSchema(
+                id=item.id, status=status.HTTP_200_OK, article=articles[item.id]
+            )
+            for item in items
+        ]
+
+    async def get_stats(self) -> ArticleStatsSchema:
+        """Return number of all articles, a sum of the striped total."""
+
+        total = await ArticleDataManager(self.session).get_total_count()
+        return ArticleStatsSchema(total=total)
+
+    async def get_author_stats(
+            self,
+            limit: int,
+            cursor: str | None = None,
+            author_ids: Collection[int] = (),
+    ) -> AuthorStatsPageSchema:
+        """Return page of article counts by author, ordered by author id.
+
+        Authors without articles are omitted.
+        """
+
+        after_id = 0
+        if cursor is not None:
+            try:
+                after_id, = decode_cursor(cursor)
+                after_id = int(after_id)
+            except (TypeError, ValueError):
+                raise BadRequest("Invalid cursor.")
+
+        rows = await ArticleDataManager(self.session).get_author_counts(
+            limit, after_id, author_ids
         )
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(rows[limit - 1].author_id)
+        return AuthorStatsPageSchema(
+            items=self.to_schemas(AuthorStatsSchema, rows[:limit]),
+            next_cursor=next_cursor,
+        )
+
+    async def refresh_stats(self) -> ArticleStatsSchema:
+        """Recount articles by a full scan and replace the counters.
+
+        Needed once for articles written before the counters existed,
+        or to repair them after articles were changed bypassing the service.
+        """
+
+        await ArticleDataManager(self.session).refresh_counts()
+        await self.session.commit()
+        return await self.get_stats()
+
+    async def export_articles(
+            self, after_id: int = 0
+    ) -> AsyncIterator[List[ArticleSchema]]:
+        """Yield batches of all articles ordered by id.
+
+        Export is resumed by passing id of the last exported article
+        as ``after_id``.
+        """
+
+        async for rows in ArticleDataManager(self.session).stream_articles(after_id):
+            yield self.to_schemas(ArticleSchema, rows)
 
+    async def build_search_index(self) -> None:
+        """Build the fallback search index unless the database has full
+        text search or the index is built already.
 
-class ArticleDataManager(BaseDataManager):
-    def get_article_model(self, article_id: int) -> ArticleModel:
+        The index is held by the worker process, so every worker builds
+        its own. Run by the first search, or on application startup if
+        ``build_search_index_on_startup`` is enabled.
+        """
+
+        data_manager = ArticleDataManager(self.session)
+        async with search_index_lock:
+            if article_index.loaded or data_manager.has_full_text_search():
+                return
+
+            article_index.begin_build()
+            try:
+                async for rows in data_manager.stream_articles(0):
+                    for row in rows:
+                        article_index.add(row.id, row.title, row.text)
+            except BaseException:
+                article_index.clear()
+                raise
+            article_index.finish_build()
+
+    @staticmethod
+    async def _index_articles(models: Sequence[ArticleModel]) -> None:
+        """Queue update of the fallback search index, once it is built or
+        being built."""
+
+        if article_index.loaded or article_index.building:
+            await job_queue.enqueue(
+                "articles.index",
+                articles=[(model.id, model.title, model.text) for model in models],
+            )
+
+    @staticmethod
+    def _decode_rank_position(cursor: str | None) -> Tuple[float, int] | None:
+        if cursor is None:
+            return None
+
+        try:
+            rank, article_id = decode_cursor(cursor)
+            return float(rank), int(article_id)
+        except (TypeError, ValueError):
+            raise BadRequest("Invalid cursor.")
+
+    @staticmethod
+    def _decode_position(
+            cursor: str | None,
+    ) -> Tuple[datetime.datetime, int] | None:
+        if cursor is None:
+            return None
+
+        try:
+            created_at, article_id = decode_cursor(cursor)
+            return datetime.datetime.fromisoformat(created_at), int(article_id)
+        except (TypeError, ValueError):
+            raise BadRequest("Invalid cursor.")
+
+
+class ArticleDataManager(AsyncBaseDataManager):
+    async def get_article_model(self, article_id: int) -> ArticleModel:
         stmt = select(ArticleModel).where(ArticleModel.id == article_id)
-        model = self.get_one(stmt)
+        model = await self.get_one(stmt)
         return model
 
-    def get_article(self, article_id: int) -> ArticleSchema:
-        model = self.get_article_model(article_id)
+    async def update_article(
+            self,
+            article_id: int,
+            item: ArticleUpdateSchema,
+            author_id: int | None = None,
+    ) -> ArticleModel | None:
+        """Update article, optionally only if written by ``author_id``.
+
+        Returns:
+            Updated article or :obj:`None` if no article was updated.
+        """
+
+        stmt = update(ArticleModel).where(ArticleModel.id == article_id)
+        if author_id is not None:
+            stmt = stmt.where(ArticleModel.author_id == author_id)
+        stmt = stmt.values(**item.model_dump()).returning(ArticleModel)
+        return await self.get_one(stmt)
+
+    async def add_articles(
+            self,
+            items: Sequence[ArticleCreateSchema],
+            author_id: int,
+    ) -> List[ArticleModel]:
+        values = [
+            dict(title=item.title, text=item.text, author_id=author_id)
+            for item in items
+        ]
+        return await self.insert_many(
+            ArticleModel, values, config.database.batch_size
+        )
+
+    async def update_articles(self, items: Sequence[ArticleBulkUpdateSchema]) -> None:
+        values = [item.model_dump() for item in items]
+        await self.update_many(ArticleModel, values, config.database.batch_size)
+
+    async def increment_counts(self, counts: Dict[int, int]) -> None:
+        """Add numbers of new articles by author to the counters.
+
+        Counters are upserted in the current transaction, in the order
+        of author ids and then a random stripe of the total, so concurrent
+        writers lock them in the same order and rarely share a stripe.
+        """
+
+        stmt = self.upsert(ArticleCountModel).values(
+            [
+                dict(author_id=author_id, count=count)
+                for author_id, count in sorted(counts.items())
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ArticleCountModel.author_id],
+            set_={"count": ArticleCountModel.count + stmt.excluded.count},
+        )
+        await self.session.execute(stmt)
+
+        stmt = self.upsert(ArticleTotalModel).values(
+            stripe=random.randrange(ARTICLES_TOTAL_STRIPES),
+            count=sum(counts.values()),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ArticleTotalModel.stripe],
+            set_={"count": ArticleTotalModel.count + stmt.excluded.count},
+        )
+        await self.session.execute(stmt)
+
+    async def get_total_count(self) -> int:
+        """Sum the stripes of the total, a fixed number of rows."""
+
+        return int(await self.get_one(self.select_total_count()))
+
+    @staticmethod
+    def select_total_count() -> Select:
+        return select(func.coalesce(func.sum(ArticleTotalModel.count), 0))
+
+    async def get_author_counts(
+            self,
+            limit: int,
+            after_id: int,
+            author_ids: Collection[int],
+    ) -> List[Any]:
+        """Read ``(author_id, count)`` rows after ``after_id``, one extra."""
+
+        stmt = select(ArticleCountModel.author_id, ArticleCountModel.count).where(
+            ArticleCountModel.author_id > after_id
+        )
+        if author_ids:
+            stmt = stmt.where(ArticleCountModel.author_id.in_(author_ids))
+        stmt = stmt.order_by(ArticleCountModel.author_id).limit(limit + 1)
+        return await self.get_rows(stmt)
+
+    async def refresh_counts(self) -> None:
+        """Replace the counters with counts of a full scan of articles."""
+
+        dialect = self.session.get_bind().dialect.name
+        for stmt in self.refresh_counts_statements(dialect):
+            await self.session.execute(stmt)
+
+    @staticmethod
+    def refresh_counts_statements(dialect: str) -> List[Executable]:
+        stmts: List[Executable] = []
+        if dialect == "postgresql":
+            # keep articles from being written until the counters are replaced
+            table = f"{ArticleModel.schema()}.{ArticleModel.table_name()}"
+            stmts.append(text(f"LOCK TABLE {table} IN SHARE MODE"))
+
+        stmts.append(delete(ArticleCountModel))
+        stmts.append(
+            insert(ArticleCountModel).from_select(
+                ["author_id", "count"],
+                select(ArticleModel.author_id, func.count()).group_by(
+                    ArticleModel.author_id
+                ),
+            )
+        )
+        stmts.append(delete(ArticleTotalModel))
+        stmts.append(
+            insert(ArticleTotalModel).from_select(
+                ["stripe", "count"], select(literal(0), func.count(ArticleModel.id))
+            )
+        )
+        return stmts
+
+    async def get_article_authors(self, article_ids: Collection[int]) -> Dict[int, int]:
+        """Map ids of existing articles to ids of their authors."""
+
+        stmt = select(ArticleModel.id, ArticleModel.author_id).where(
+            ArticleModel.id.in_(article_ids)
+        )
+        return {row.id: row.author_id for row in await self.get_rows(stmt)}
+
+    async def get_articles_by_ids(
+            self, article_ids: Collection[int]
+    ) -> List[ArticleModel]:
+        stmt = (
+            select(ArticleModel)
+            .where(ArticleModel.id.in_(article_ids))
+            .execution_options(populate_existing=True)
+        )
+        return await self.get_all(stmt)
+
+    def has_full_text_search(self) -> bool:
+        # replicas share the dialect of the session's own bind, checking it
+        # does not route the session to a replica
+        bind = self.session.bind or self.session.get_bind()
+        return bind.dialect.name == "postgresql"
+
+    async def search_articles(
+            self,
+            query: str,
+            limit: int,
+            position: Tuple[float, int] | None,
+    ) -> ArticlePageSchema:
+        """Search articles using the Postgres ``search_vector`` column.
+
+        Matches are found by the GIN index and only they are ranked by
+        ``ts_rank``. Pages are keyed by ``(rank, id)``.
+        """
+
+        vector = literal_column("search_vector", TSVECTOR)
+        tsquery = func.websearch_to_tsquery(
+            cast(ARTICLES_SEARCH_CONFIG, REGCONFIG), query
+        )
+        rank = func.ts_rank(vector, tsquery)
+
+        stmt = select(ArticleModel, rank.label("rank")).where(vector.op("@@")(tsquery))
+        if position is not None:
+            stmt = stmt.where(
+                tuple_(rank, ArticleModel.id) < tuple_(*map(literal, position))
+            )
+        stmt = stmt.order_by(rank.desc(), ArticleModel.id.desc()).limit(limit + 1)
+        rows = await self.get_rows(stmt)
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last.rank, last.ArticleModel.id)
+        models = [row.ArticleModel for row in rows[:limit]]
+        return ArticlePageSchema(
+            items=self.to_schemas(ArticleSchema, models), next_cursor=next_cursor
+        )
+
+    def stream_articles(self, after_id: int) -> AsyncIterator[Sequence[Any]]:
+        """Stream rows of articles with id greater than ``after_id``.
+
+        Columns are selected instead of models, so streamed rows are not
+        kept in the session.
+        """
+
+        return self.stream_rows(
+            self.select_articles_after(after_id), config.database.fetch_size
+        )
+
+    @staticmethod
+    def select_articles_after(after_id: int) -> Select:
+        return (
+            select(*ArticleModel.__table__.c)
+            .where(ArticleModel.id > after_id)
+            .order_by(ArticleModel.id)
+        )
+
+    async def get_article_version(
+            self, article_id: int
+    ) -> datetime.datetime | None:
+        stmt = select(ArticleModel.updated_at).where(ArticleModel.id == article_id)
+        return await self.get_one(stmt)
+
+    async def get_page_versions(
+            self,
+            limit: int,
+            position: Tuple[datetime.datetime, int] | None,
+            filters: ArticleFilterSchema,
+    ) -> Tuple[List[Tuple[int, datetime.datetime]], str | None]:
+        """Read ``(id, updated_at)`` of page items and the next page cursor."""
+
+        stmt = select(
+            ArticleModel.id, ArticleModel.created_at, ArticleModel.updated_at
+        )
+        rows = await self.get_rows(self.select_page(stmt, limit, position, filters))
+
+        versions = [(row.id, row.updated_at) for row in rows[:limit]]
+        return versions, self.next_cursor(rows, limit)
+
+    async def get_article(self, article_id: int) -> ArticleSchema:
+        model = await self.get_article_model(article_id)
         if not isinstance(model, ArticleModel):
-            raise_with_log(status.HTTP_404_NOT_FOUND, "Article not found.")
+            raise NotFound("Article not found.")
+
+        return self.to_schema(ArticleSchema, model)
+
+    async def get_articles(
+            self,
+            limit: int,
+            position: Tuple[datetime.datetime, int] | None,
+            filters: ArticleFilterSchema,
+    ) -> ArticlePageSchema:
+        """Read page of articles ordered from newest to oldest."""
 
-        return ArticleSchema(**model.to_dict())
+        stmt = self.select_page(select(ArticleModel), limit, position, filters)
+        models = await self.get_all(stmt)
 
-    def get_articles(self) -> List[ArticleSchema]:
-        schemas: List[ArticleSchema] = list()
+        return ArticlePageSchema(
+            items=self.to_schemas(ArticleSchema, models[:limit]),
+            next_cursor=self.next_cursor(models, limit),
+        )
 
-        stmt = select(ArticleModel)
+    async def get_article_summaries(
+            self,
+            limit: int,
+            position: Tuple[datetime.datetime, int] | None,
+            filters: ArticleFilterSchema,
+    ) -> ArticleSummaryPageSchema:
+        """Read page of articles without their text.
+
+        Only the summary columns are selected and schemas are built
+        directly from the result rows, skipping the ORM instances.
+        """
+
+        stmt = select(
+            ArticleModel.id,
+            ArticleModel.title,
+            ArticleModel.author_id,
+            ArticleModel.created_at,
+            ArticleModel.updated_at,
+        )
+        stmt = self.select_page(stmt, limit, position, filters)
+        rows = await self.get_rows(stmt)
+
+        return ArticleSummaryPageSchema(
+            items=self.to_schemas(ArticleSummarySchema, rows[:limit]),
+            next_cursor=self.next_cursor(rows, limit),
+        )
+
+    def select_page(
+            self,
+            stmt: Select,
+            limit: int,
+            position: Tuple[datetime.datetime, int] | None,
+            filters: ArticleFilterSchema,
+    ) -> Select:
+        """Apply filters and keyset pagination over ``(created_at, id)``.
+
+        The page starts right after ``position`` so the cost does not depend
+        on the page number. One extra row is selected to detect whether
+        the next page exists.
+        """
+
+        stmt = self.filter_articles(stmt, filters)
+        if position is not None:
+            stmt = stmt.where(
+                tuple_(ArticleModel.created_at, ArticleModel.id)
+                < tuple_(*map(literal, position))
+            )
+        return stmt.order_by(
+            ArticleModel.created_at.desc(), ArticleModel.id.desc()
+        ).limit(limit + 1)
+
+    @staticmethod
+    def next_cursor(rows: Sequence[Any], limit: int) -> str | None:
+        if len(rows) <= limit:
+            return None
+        last = rows[limit - 1]
+        return encode_cursor(last.created_at.isoformat(), last.id)
+
+    @staticmethod
+    def filter_articles(stmt: Select, filters: ArticleFilterSchema) -> Select:
+        if filters.author_id is not None:
+            stmt = stmt.where(ArticleModel.author_id == filters.author_id)
+        if filters.created_from is not None:
+            stmt = stmt.where(ArticleModel.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            stmt = stmt.where(ArticleModel.created_at < filters.created_to)
+        return stmt
+
+
+class SyncArticleDataManager(BaseDataManager):
+    """Article queries of the ``myapi`` CLI, see :class:`ArticleDataManager`."""
+
+    def stream_articles(self, after_id: int) -> Iterator[Sequence[Any]]:
+        return self.stream_rows(
+            ArticleDataManager.select_articles_after(after_id),
+            config.database.fetch_size,
+        )
 
-        for model in self.get_all(stmt):
-            schemas += [ArticleSchema(**model.to_dict())]
+    def get_total_count(self) -> int:
+        return int(self.get_one(ArticleDataManager.select_total_count()))
 
-        return schemas
+    def refresh_counts(self) -> None:
+        dialect = self.session.get_bind().dialect.name
+        for stmt in ArticleDataManager.refresh_counts_statements(dialect):
+            self.session.execute(stmt)
@@ -1,55 +1,94 @@
-from datetime import (
-    datetime,
-    timedelta,
+import hashlib
+import time
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Sequence,
+    Set,
 )
 
-from fastapi import (
-    Depends,
-    status,
-)
+from fastapi import Depends
 from fastapi.security import (
     OAuth2PasswordBearer,
     OAuth2PasswordRequestForm,
 )
 from jose import (
     jwt,
+    ExpiredSignatureError,
     JWTError,
 )
+from loguru import logger
 from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import (
+    Select,
+    select,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.base import ExecutableOption
 
 from app import const
+from app.backend.cache import (
+    get_cache,
+    MemoryCacheBackend,
+)
 from app.backend.config import config
+from app.backend.hashing import (
+    hashing_executor,
+    HashingExecutor,
+)
+from app.backend.jobs import job_queue
+from app.backend.metrics import timed
 from app.const import (
     AUTH_URL,
     TOKEN_ALGORITHM,
     TOKEN_EXPIRE_MINUTES,
     TOKEN_TYPE,
 )
-from app.exc import raise_with_log
+from app.exc import (
+    BadRequest,
+    NotFound,
+    Unauthorized,
+)
 from app.models.auth import UserModel, GroupModel, GroupUserModel
 from app.schemas.auth import (
     CreateUserSchema,
     TokenSchema,
-    UserSchema, AuthUserSchema,
+    UserSchema, AuthUserSchema, CurrentUserSchema,
 )
 from app.services.base import (
+    AsyncBaseDataManager,
     BaseDataManager,
     BaseService,
 )
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=config.hashing.bcrypt_rounds,
+)
 
 oauth2_schema = OAuth2PasswordBearer(tokenUrl=AUTH_URL, auto_error=False)
 
+# decoded users by token digest, each kept until its token expires
+token_cache = MemoryCacheBackend(
+    ttl=TOKEN_EXPIRE_MINUTES * 60, max_entries=config.cache.token_max_entries
+)
+
 
-async def get_current_user(token: str = Depends(oauth2_schema)) -> UserSchema | None:
+async def get_current_user(
+    token: str | None = Depends(oauth2_schema),
+) -> CurrentUserSchema | None:
     """Decode token to obtain user information.
 
     Extracts user information from token and verifies expiration time.
-    If token is valid then instance of :class:`~app.schemas.auth.UserSchema`
-    is returned, otherwise exception is raised.
+    If token is valid then instance of
+    :class:`~app.schemas.auth.CurrentUserSchema` is returned, otherwise exception is raised. Decoded users are cached
+    by token digest until the token expires.
 
     Args:
         token:
@@ -60,82 +99,162 @@ async def get_current_user(token: str = Depends(oauth2_schema)) -> UserSchema |
     """
 
     if token is None:
-        raise_with_log(status.HTTP_401_UNAUTHORIZED, "Invalid token")
+        raise Unauthorized("Invalid token")
+
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    user = await token_cache.get(digest)
+    if user is not None:
+        return user
 
     try:
-        # decode token using secret token key provided by config
-        payload = jwt.decode(token, config.token_key, algorithms=[TOKEN_ALGORITHM])
+        # decode token using secret token key provided by config,
+        # numeric "exp" claim is verified by the decoder
+        with timed("jwt"):
+            payload = jwt.decode(
+                token,
+                config.token_key,
+                algorithms=[TOKEN_ALGORITHM],
+                options={"require_exp": True},
+            )
+    except ExpiredSignatureError:
+        raise Unauthorized("Token expired")
+    except JWTError:
+        raise Unauthorized("Invalid credentials")
 
-        # extract encoded information
-        id: int = int(payload.get("id", 0))
-        name: str = payload.get("name")
-        email: str = payload.get("email")
-        expires_at: str = payload.get("expires_at")
-        if email is None:
-            raise_with_log(status.HTTP_401_UNAUTHORIZED, "Invalid credentials")
+    # extract encoded information
+    id: int = int(payload.get("id", 0))
+    name: str = payload.get("name")
+    email: str = payload.get("email")
+    groups: List[str] = payload.get("groups", [])
+    if email is None:
+        raise Unauthorized("Invalid credentials")
 
-        if is_expired(expires_at):
-            raise_with_log(status.HTTP_401_UNAUTHORIZED, "Token expired")
+    user = CurrentUserSchema(id=id, name=name, email=email, groups=frozenset(groups))
+    await token_cache.set(digest, user, ttl=payload["exp"] - time.time())
+    return user
+
+
+def hash_passwords(passwords: Sequence[str]) -> List[str]:
+    """Hash passwords, runs in worker processes of bulk imports."""
+
+    return [pwd_context.hash(password) for password in passwords]
 
-        return UserSchema(id=id, name=name, email=email)
-    except JWTError:
-        raise_with_log(status.HTTP_401_UNAUTHORIZED, "Invalid credentials")
 
-    return None
+@job_queue.job("users.created")
+async def users_created(user_ids: Sequence[int]) -> None:
+    """Announce new users, the place for future notifications."""
 
+    logger.info("Users {} created", user_ids)
 
-def is_expired(expires_at: str) -> bool:
-    """Return :obj:`True` if token has expired."""
 
-    return datetime.strptime(expires_at, "%Y-%m-%d %H:%M:%S") < datetime.utcnow()
+def groups_key(user_id: int) -> str:
+    """Cache key of user group membership."""
+
+    return f"auth:groups:{user_id}"
 
 
 class HashingMixin:
-    """Hashing and verifying passwords."""
+    """Hashing and verifying passwords.
+
+    Hashing is offloaded to :data:`app.backend.hashing.hashing_executor`
+    so it does not block the event loop.
+    """
 
     @staticmethod
-    def bcrypt(password: str) -> str:
+    async def bcrypt(password: str) -> str:
         """Generate a bcrypt hashed password."""
 
-        return pwd_context.hash(password)
+        with timed("bcrypt"):
+            return await hashing_executor.run(pwd_context.hash, password)
 
     @staticmethod
-    def verify(password: str, plain_password: str) -> bool:
+    async def verify(password: str, plain_password: str) -> bool:
         """Verify a password against a hash."""
 
-        return pwd_context.verify(plain_password, password)
+        with timed("bcrypt"):
+            return await hashing_executor.run(
+                pwd_context.verify, plain_password, password
+            )
 
 
 class AuthService(HashingMixin, BaseService):
     """Authentication service."""
 
-    def get_user(self, email: str) -> UserSchema:
-        model = AuthDataManager(self.session).get_user_model(email)
-        return UserSchema(
-            id=model.id,
-            name=model.name,
-            email=model.email,
-        )
+    async def get_user(self, email: str) -> UserSchema:
+        model = await AuthDataManager(self.session).get_user_model(email)
+        return self.to_schema(UserSchema, model)
 
-    def create_user(self, user: CreateUserSchema) -> UserModel:
-        """Add user with hashed password to database."""
+    async def create_user(self, user: CreateUserSchema) -> UserModel:
+        """Add user with hashed password to database.
+
+        Duplicate email addresses are detected by the unique constraint,
+        no extra query is made.
+        """
 
-        model_by_email = AuthDataManager(self.session).get_user_model(user.email)
-        if isinstance(model_by_email, UserModel):
-            raise_with_log(
-                status.HTTP_400_BAD_REQUEST,
-                "The user with specified email address already exists"
-            )
         user_model = UserModel(
             name=user.name,
             email=user.email,
-            password=self.bcrypt(user.password),
+            password=await self.bcrypt(user.password),
         )
 
-        AuthDataManager(self.session).add_user(user_model)
+        try:
+            await AuthDataManager(self.session).add_user(user_model)
+        except IntegrityError:
+            await self.session.rollback()
+            raise BadRequest("The user with specified email address already exists")
+
+        await self.session.commit()
+        await job_queue.enqueue("users.created", user_ids=[user_model.id])
         return user_model
 
-    def authenticate(
+    async def import_users(
+        self,
+        users: Sequence[CreateUserSchema],
+        group_codes: Collection[str] = (),
+        executor: HashingExecutor = hashing_executor,
+    ) -> List[UserModel]:
+        """Add users whose email addresses are not taken yet.
+
+        Taken addresses are looked up by a single query, passwords are
+        hashed in parallel by ``executor`` and users are written by batched
+        inserts. New users are optionally added to the given groups. All
+        users are committed at once.
+
+        Returns:
+            Created users, users with duplicate email addresses are skipped.
+        """
+
+        unique: Dict[str, CreateUserSchema] = dict()
+        for user in users:
+            unique.setdefault(user.email, user)
+
+        data_manager = AuthDataManager(self.session)
+        taken = await data_manager.get_taken_emails(unique)
+        new_users = [user for user in unique.values() if user.email not in taken]
+        if not new_users:
+            return []
+
+        passwords = await executor.map(
+            hash_passwords, [user.password for user in new_users]
+        )
+        models = await data_manager.add_users(
+            [
+                dict(name=user.name, email=user.email, password=password)
+                for user, password in zip(new_users, passwords)
+            ]
+        )
+        if group_codes:
+            await GroupService(self.session).add_users_to_groups(
+                [model.id for model in models], group_codes
+            )
+
+        await self.session.commit()
+        await job_queue.enqueue(
+            "users.created", user_ids=[model.id for model in models]
+        )
+        return models
+
+    async def authenticate(
         self, login: OAuth2PasswordRequestForm = Depends()
     ) -> TokenSchema | None:
         """Generate token.
@@ -145,89 +264,186 @@ class AuthService(HashingMixin, BaseService):
         token is generated, otherwise the corresponding exception is raised.
         """
 
-        user = AuthDataManager(self.session).get_user(login.username)
+        user = await AuthDataManager(self.session).get_user(login.username)
 
         if user.password is None:
-            raise_with_log(status.HTTP_401_UNAUTHORIZED, "Incorrect password")
+            raise Unauthorized("Incorrect password")
         else:
-            if not self.verify(user.password, login.password):
-                raise_with_log(status.HTTP_401_UNAUTHORIZED, "Incorrect password")
+            if not await self.verify(user.password, login.password):
+                raise Unauthorized("Incorrect password")
             else:
-                access_token = self._create_access_token(user.id, user.name, user.email)
+                groups = await self.get_groups(user.id)
+                access_token = self._create_access_token(
+                    user.id, user.name, user.email, groups
+                )
                 return TokenSchema(access_token=access_token, token_type=TOKEN_TYPE)
         return None
 
-    def is_admin(self, user: UserSchema):
-        return AuthDataManager(self.session).is_admin(user.id)
+    async def is_admin(self, user: UserSchema) -> bool:
+        """Return :obj:`True` if user belongs to the admin group.
+
+        Membership granted by the token claim is trusted, otherwise the
+        cached group membership is checked.
+        """
+
+        if isinstance(user, CurrentUserSchema) and const.ADMIN_GROUP in user.groups:
+            return True
+        return const.ADMIN_GROUP in await self.get_groups(user.id)
 
-    def _create_access_token(self, id: int, name: str, email: str) -> str:
-        """Encode user information and expiration time."""
+    async def get_groups(self, user_id: int) -> FrozenSet[str]:
+        """Return codes of groups the user belongs to.
+
+        Membership is cached until it is changed by
+        :class:`~app.services.auth.GroupService`. Only the cache of the
+        process making the change is invalidated, other processes, e.g.
+        the workers when the change is made by the CLI, see it after up
+        to ``config.cache.ttl`` seconds unless the cache is shared.
+        """
+
+        return await get_cache().get_or_set(
+            groups_key(user_id),
+            lambda: AuthDataManager(self.session).get_group_codes(user_id),
+            FrozenSet[str],
+        )
+
+    def _create_access_token(
+        self, id: int, name: str, email: str, groups: Iterable[str] = ()
+    ) -> str:
+        """Encode user information, group codes and expiration time."""
 
         payload = {
             "id": id,
             "name": name,
             "email": email,
-            "expires_at": self._expiration_time(),
+            "groups": sorted(groups),
+            "exp": self._expiration_time(),
         }
 
         return jwt.encode(payload, config.token_key, algorithm=TOKEN_ALGORITHM)
 
     @staticmethod
-    def _expiration_time() -> str:
-        """Get token expiration time."""
+    def _expiration_time() -> int:
+        """Get token expiration time as a UNIX timestamp."""
 
-        expires_at = datetime.utcnow() + timedelta(minutes=TOKEN_EXPIRE_MINUTES)
-        return expires_at.strftime("%Y-%m-%d %H:%M:%S")
+        return int(time.time()) + TOKEN_EXPIRE_MINUTES * 60
 
 
-class AuthDataManager(BaseDataManager):
-    def add_user(self, user: UserModel) -> None:
+class AuthDataManager(AsyncBaseDataManager):
+    async def add_user(self, user: UserModel) -> None:
         """Write user to database."""
 
-        self.add_one(user)
+        await self.add_one(user)
+
+    async def add_users(
+        self, values: Sequence[Dict[str, Any]]
+    ) -> List[UserModel]:
+        """Write users to database in batches."""
+
+        return await self.insert_many(UserModel, values, config.database.batch_size)
 
-    def get_user(self, email: str) -> AuthUserSchema:
+    async def get_taken_emails(self, emails: Collection[str]) -> Set[str]:
+        """Return those of ``emails`` that already belong to a user."""
+
+        return set(await self.get_all(self.select_taken_emails(emails)))
+
+    @staticmethod
+    def select_taken_emails(emails: Collection[str]) -> Select:
+        return select(UserModel.email).where(UserModel.email.in_(emails))
+
+    async def get_user(self, email: str) -> AuthUserSchema:
         """Read user from database."""
 
-        model = self.get_user_model(email)
+        model = await self.get_user_model(email)
+        if model is None:
+            raise NotFound("User not found.")
 
-        return AuthUserSchema(
-            id=model.id,
-            name=model.name,
-            email=model.email,
-            password=model.password,
-        )
+        return self.to_schema(AuthUserSchema, model)
 
-    def get_user_model(self, email: str) -> UserModel | None:
-        return self.get_one(select(UserModel).where(UserModel.email == email))
+    async def get_user_model(
+        self, email: str, options: Sequence[ExecutableOption] = ()
+    ) -> UserModel | None:
+        stmt = select(UserModel).where(UserModel.email == email)
+        return await self.get_one(stmt, options)
 
-    def is_admin(self, user_id) -> bool:
-        model = self.get_one(select(GroupUserModel).where(
-            GroupUserModel.user_id == user_id,
-            GroupUserModel.group_id == const.ADMIN_GROUP
-        ))
-        return isinstance(model, GroupUserModel)
+    async def get_group_codes(self, user_id: int) -> FrozenSet[str]:
+        stmt = select(GroupUserModel.group_id).where(
+            GroupUserModel.user_id == user_id
+        )
+        return frozenset(await self.get_all(stmt))
 
 
 class GroupService(BaseService):
     """Group permissions service."""
 
-    def get_or_create_admin_group(self) -> GroupModel:
-        model = GroupDataManager(self.session).get_group_model(const.ADMIN_GROUP)
+    async def add_users_to_groups(
+        self, user_ids: Sequence[int], codes: Collection[str]
+    ) -> None:
+        """Add users to groups in batches, the caller commits."""
+
+        values = [
+            dict(user_id=user_id, group_id=code)
+            for user_id in user_ids
+            for code in codes
+        ]
+        await GroupDataManager(self.session).insert_many(
+            GroupUserModel, values, config.database.batch_size
+        )
+        await get_cache().delete(*map(groups_key, user_ids))
+
 
+class GroupDataManager(AsyncBaseDataManager):
+    async def get_group_model(self, code: str) -> GroupModel | None:
+        return await self.get_one(select(GroupModel).where(GroupModel.code == code))
+
+    async def get_group_codes(self, codes: Collection[str]) -> Set[str]:
+        return set(await self.get_all(self.select_group_codes(codes)))
+
+    @staticmethod
+    def select_group_codes(codes: Collection[str]) -> Select:
+        return select(GroupModel.code).where(GroupModel.code.in_(codes))
+
+
+class SyncAuthDataManager(BaseDataManager):
+    """User queries of the ``myapi`` CLI, see :class:`AuthDataManager`."""
+
+    def add_user(self, user: UserModel) -> None:
+        self.add_one(user)
+
+    def add_users(self, values: Sequence[Dict[str, Any]]) -> List[UserModel]:
+        return self.insert_many(UserModel, values, config.database.batch_size)
+
+    def get_taken_emails(self, emails: Collection[str]) -> Set[str]:
+        return set(self.get_all(AuthDataManager.select_taken_emails(emails)))
+
+
+class SyncGroupDataManager(BaseDataManager):
+    """Group queries of the ``myapi`` CLI, see :class:`GroupDataManager`.
+
+    Changed membership is not invalidated in the cache of the running
+    workers, they see it once their cached groups expire, see
+    :meth:`AuthService.get_groups`.
+    """
+
+    def get_or_create_admin_group(self) -> GroupModel:
+        stmt = select(GroupModel).where(GroupModel.code == const.ADMIN_GROUP)
+        model = self.get_one(stmt)
         if not isinstance(model, GroupModel):
             model = GroupModel(code=const.ADMIN_GROUP, name="Admin")
-            GroupDataManager(self.session).add_one(model)
-            return model
+            self.add_one(model)
         return model
 
-    def add_user_to_admin_group(self, user: UserModel) -> None:
-        group = self.get_or_create_admin_group()
-        group_user_model = GroupUserModel(user_id=user.id, group_id=group.code)
-        GroupDataManager(self.session).add_one(group_user_model)
-        return
-
-
-class GroupDataManager(BaseDataManager):
-    def get_group_model(self, code: str) -> GroupModel | None:
-        return self.get_one(select(GroupModel).where(GroupModel.code == code))
+    def get_missing_groups(self, codes: Collection[str]) -> Set[str]:
+        """Return those of group ``codes`` that do not exist."""
+
+        stmt = GroupDataManager.select_group_codes(codes)
+        return set(codes) - set(self.get_all(stmt))
+
+    def add_users_to_groups(
+        self, user_ids: Sequence[int], codes: Collection[str]
+    ) -> None:
+        values = [
+            dict(user_id=user_id, group_id=code)
+            for user_id in user_ids
+            for code in codes
+        ]
+        self.insert_many(GroupUserModel, values, config.database.batch_size)
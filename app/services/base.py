@@ -1,18 +1,111 @@
+import base64
+from functools import cache
+import json
 from typing import (
     Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
     List,
     Sequence,
+    Tuple,
     Type,
+    TypeVar,
 )
 
+from pydantic import TypeAdapter
+
 from sqlalchemy import (
     func,
+    insert,
+    Row,
     select,
+    update,
+)
+from sqlalchemy.dialects import (
+    postgresql,
+    sqlite,
 )
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.base import ExecutableOption
 from sqlalchemy.sql.expression import Executable
 
 from app.models.base import SQLModel
+from app.schemas.base import BaseSchema
+
+
+SchemaT = TypeVar("SchemaT", bound=BaseSchema)
+T = TypeVar("T")
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode keyset pagination position into an opaque cursor string."""
+
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode cursor string produced by :func:`encode_cursor`.
+
+    Raises:
+        ValueError: The cursor is malformed.
+    """
+
+    values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    if not isinstance(values, list):
+        raise ValueError("Malformed cursor")
+    return values
+
+
+def chunks(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """Split sequence into consecutive chunks of at most ``size`` items."""
+
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@cache
+def list_adapter(schema: Type[SchemaT]) -> TypeAdapter[List[SchemaT]]:
+    """Return cached validator of a list of ``schema`` instances."""
+
+    return TypeAdapter(List[schema])  # type: ignore[valid-type]
+
+
+class SchemaMixin:
+    """Converts models and result rows to schemas."""
+
+    @staticmethod
+    def to_schema(schema: Type[SchemaT], obj: Any) -> SchemaT:
+        return schema.model_validate(obj, from_attributes=True)
+
+    @staticmethod
+    def to_schemas(schema: Type[SchemaT], objs: Iterable[Any]) -> List[SchemaT]:
+        """Convert all objects in a single validation call.
+
+        Attributes are read directly by pydantic-core, which avoids building
+        an intermediate dictionary and schema kwargs for every row.
+        """
+
+        return list_adapter(schema).validate_python(objs, from_attributes=True)
+
+
+class StatementMixin:
+    """Builds statements shared by the sync and async data managers."""
+
+    @staticmethod
+    def select_from_tvf(model: Type[SQLModel], *args: Any) -> Executable:
+        fn = getattr(getattr(func, model.schema()), model.table_name())
+        stmt = select(fn(*args).table_valued(*model.fields()))
+        return select(model).from_statement(stmt)
+
+    @staticmethod
+    def with_options(
+            select_stmt: Executable,
+            options: Sequence[ExecutableOption],
+    ) -> Executable:
+        return select_stmt.options(*options) if options else select_stmt
 
 
 class SessionMixin:
@@ -22,35 +115,153 @@ class SessionMixin:
         self.session = session
 
 
-class BaseService(SessionMixin):
+class AsyncSessionMixin:
+    """Provides instance of asynchronous database session."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+
+class BaseService(SchemaMixin, AsyncSessionMixin):
     """Base class for application services."""
 
 
-class BaseDataManager(SessionMixin):
-    """Base data manager class responsible for operations over database."""
+class BaseDataManager(SchemaMixin, StatementMixin, SessionMixin):
+    """Base data manager class responsible for operations over database.
+
+    Used by the ``myapi`` CLI, which has no event loop to keep responsive.
+    Writes are flushed but not committed, the session context commits.
+    """
 
     def add_one(self, model: Any) -> None:
         self.session.add(model)
-        self.session.commit()
+        self.session.flush()
 
-    def update_one(self, model: Any, data) -> None:
+    def update_one(self, model: Any, data: Iterable[Tuple[str, Any]]) -> None:
         for key, value in data:
             if hasattr(model, key):
                 setattr(model, key, value)
-        self.session.commit()
+        self.session.flush()
 
     def add_all(self, models: Sequence[Any]) -> None:
         self.session.add_all(models)
 
-    def get_one(self, select_stmt: Executable) -> Any:
-        return self.session.scalar(select_stmt)
+    def get_one(
+            self,
+            select_stmt: Executable,
+            options: Sequence[ExecutableOption] = (),
+    ) -> Any:
+        return self.session.scalar(self.with_options(select_stmt, options))
+
+    def get_all(
+            self,
+            select_stmt: Executable,
+            options: Sequence[ExecutableOption] = (),
+    ) -> List[Any]:
+        stmt = self.with_options(select_stmt, options)
+        return list(self.session.scalars(stmt).all())
 
-    def get_all(self, select_stmt: Executable) -> List[Any]:
-        return list(self.session.scalars(select_stmt).all())
+    def get_rows(self, select_stmt: Executable) -> List[Row]:
+        return list(self.session.execute(select_stmt).all())
+
+    def stream_rows(
+            self, select_stmt: Executable, size: int
+    ) -> Iterator[Sequence[Row]]:
+        """Yield result rows in batches of ``size`` using a server side cursor."""
+
+        result = self.session.execute(select_stmt.execution_options(yield_per=size))
+        yield from result.partitions()
 
     def get_from_tvf(self, model: Type[SQLModel], *args: Any) -> List[Any]:
         """Query from table valued function.
 
+        See :meth:`AsyncBaseDataManager.get_from_tvf`.
+        """
+
+        return self.get_all(self.select_from_tvf(model, *args))
+
+    def insert_many(
+            self,
+            model: Type[SQLModel],
+            values: Sequence[Dict[str, Any]],
+            batch_size: int,
+    ) -> List[Any]:
+        """Insert rows in batches and return the inserted models."""
+
+        stmt = insert(model).returning(model, sort_by_parameter_order=True)
+        models: List[Any] = []
+        for batch in chunks(values, batch_size):
+            models += self.session.scalars(stmt, batch).all()
+        return models
+
+
+class AsyncBaseDataManager(SchemaMixin, StatementMixin, AsyncSessionMixin):
+    """Base data manager class responsible for asynchronous operations
+    over database.
+
+    Writes are flushed but not committed, the transaction is committed
+    once by the service or by the session dependency.
+    """
+
+    async def add_one(self, model: Any) -> None:
+        self.session.add(model)
+        await self.session.flush()
+
+    async def update_one(self, model: Any, data: Iterable[Tuple[str, Any]]) -> None:
+        for key, value in data:
+            if hasattr(model, key):
+                setattr(model, key, value)
+        await self.session.flush()
+
+    async def add_all(self, models: Sequence[Any]) -> None:
+        self.session.add_all(models)
+
+    async def get_one(
+            self,
+            select_stmt: Executable,
+            options: Sequence[ExecutableOption] = (),
+    ) -> Any:
+        """Return the first model or value selected by the statement.
+
+        ``options`` such as ``selectinload(UserModel.groups)`` choose
+        how relationships of this query are loaded.
+        """
+
+        return await self.session.scalar(self.with_options(select_stmt, options))
+
+    async def get_all(
+            self,
+            select_stmt: Executable,
+            options: Sequence[ExecutableOption] = (),
+    ) -> List[Any]:
+        """Return all models or values selected by the statement.
+
+        ``options`` choose relationship loader strategies of this query.
+        """
+
+        stmt = self.with_options(select_stmt, options)
+        return list((await self.session.scalars(stmt)).all())
+
+    async def get_rows(self, select_stmt: Executable) -> List[Row]:
+        return list((await self.session.execute(select_stmt)).all())
+
+    async def stream_rows(
+            self, select_stmt: Executable, size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Yield result rows in batches of ``size`` using a server side cursor.
+
+        Only a single batch is kept in memory, regardless of the result size.
+        """
+
+        result = await self.session.stream(
+            select_stmt.execution_options(yield_per=size)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+    async def get_from_tvf(self, model: Type[SQLModel], *args: Any) -> List[Any]:
+        """Query from table valued function.
+
         This is a wrapper function that can be used to retrieve data from
         table valued functions.
 
@@ -66,13 +277,50 @@ class BaseDataManager(SessionMixin):
                 z: Mapped[float] = mapped_column("z")
 
             # equivalent to "SELECT x, y, z FROM schema.function(1, 'AAA')"
-            BaseDataManager(session).get_from_tvf(MyModel, 1, "AAA")
+            await AsyncBaseDataManager(session).get_from_tvf(MyModel, 1, "AAA")
         """
 
-        return self.get_all(self.select_from_tvf(model, *args))
+        return await self.get_all(self.select_from_tvf(model, *args))
 
-    @staticmethod
-    def select_from_tvf(model: Type[SQLModel], *args: Any) -> Executable:
-        fn = getattr(getattr(func, model.schema()), model.table_name())
-        stmt = select(fn(*args).table_valued(*model.fields()))
-        return select(model).from_statement(stmt)
+    async def insert_many(
+            self,
+            model: Type[SQLModel],
+            values: Sequence[Dict[str, Any]],
+            batch_size: int,
+    ) -> List[Any]:
+        """Insert rows in batches and return the inserted models.
+
+        Each batch is sent as a single ``INSERT ... RETURNING`` statement,
+        models are returned in the order of ``values``.
+        """
+
+        stmt = insert(model).returning(model, sort_by_parameter_order=True)
+        models: List[Any] = []
+        for batch in chunks(values, batch_size):
+            models += (await self.session.scalars(stmt, batch)).all()
+        return models
+
+    def upsert(self, model: Type[SQLModel]) -> Any:
+        """Return ``INSERT`` statement of the session dialect.
+
+        Unlike the generic one, it supports ``on_conflict_do_update``
+        on both Postgres and SQLite.
+        """
+
+        if self.session.get_bind().dialect.name == "sqlite":
+            return sqlite.insert(model)
+        return postgresql.insert(model)
+
+    async def update_many(
+            self,
+            model: Type[SQLModel],
+            values: Sequence[Dict[str, Any]],
+            batch_size: int,
+    ) -> None:
+        """Update rows by primary key in batches using executemany.
+
+        Every item of ``values`` must contain the primary key of the row.
+        """
+
+        for batch in chunks(values, batch_size):
+            await self.session.execute(update(model), batch)
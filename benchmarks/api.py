@@ -0,0 +1,244 @@
+"""Load test of the API hot paths.
+
+Seeds users and articles through the services into a fresh database,
+SQLite by default, then sends requests from ``--concurrency`` concurrent
+clients to the application in-process over ASGI. Throughput and
+p50/p95/p99 latencies of every scenario are compared with the baseline
+stored by ``--save``, the exit code is 1 if any scenario regressed by
+more than ``--tolerance``.
+
+Usage:
+    python -m benchmarks.api [--users 20] [--articles 1000] [--requests 500]
+        [--concurrency 10] [--dsn sqlite:///bench.db] [--save]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+)
+
+import httpx
+
+
+BASELINE = os.path.join(os.path.dirname(__file__), "api_baseline.json")
+
+PASSWORD = "benchmark"
+
+Scenario = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+async def seed(users: int, articles: int) -> Dict[str, List[Any]]:
+    """Create schema, users and articles, return what scenarios need."""
+
+    from app.backend.schema import create_schema_async
+    from app.backend.session import open_async_session
+    from app.schemas.articles import ArticleCreateSchema
+    from app.schemas.auth import CreateUserSchema
+    from app.services.articles import ArticleService
+    from app.services.auth import AuthService
+
+    await create_schema_async()
+
+    async with open_async_session() as session:
+        user_models = await AuthService(session).import_users(
+            [
+                CreateUserSchema(
+                    name=f"user {i}", email=f"user{i}@bench.io", password=PASSWORD
+                )
+                for i in range(users)
+            ]
+        )
+
+        article_ids: List[List[int]] = []
+        for model in user_models:
+            results = await ArticleService(session).create_articles(
+                [
+                    ArticleCreateSchema(title=f"Article {i}", text="Lorem ipsum " * 50)
+                    for i in range(articles // users)
+                ],
+                model.id,
+            )
+            article_ids += [[result.id for result in results]]
+
+    return {"emails": [model.email for model in user_models], "articles": article_ids}
+
+
+async def login(client: httpx.AsyncClient, email: str) -> Dict[str, str]:
+    response = await client.post(
+        "/token", data={"username": email, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    return {"Authorization": "Bearer " + response.json()["access_token"]}
+
+
+def scenarios(
+    data: Dict[str, List[Any]], headers: List[Dict[str, str]]
+) -> Dict[str, Scenario]:
+    """Build request of every benchmarked endpoint."""
+
+    emails, articles = data["emails"], data["articles"]
+    all_articles = [article_id for ids in articles for article_id in ids]
+    body = {"title": "Benchmark", "text": "Lorem ipsum " * 50}
+
+    async def token(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        form = {"username": emails[i % len(emails)], "password": PASSWORD}
+        return await client.post("/token", data=form)
+
+    async def list_articles(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get("/articles/")
+
+    async def get_article(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get(f"/articles/{random.choice(all_articles)}")
+
+    async def post_article(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.post(
+            "/articles/", json=body, headers=headers[i % len(headers)]
+        )
+
+    async def put_article(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        user = i % len(headers)
+        article_id = random.choice(articles[user])
+        return await client.put(
+            f"/articles/{article_id}", json=body, headers=headers[user]
+        )
+
+    return {
+        "POST /token": token,
+        "GET /articles/": list_articles,
+        "GET /articles/{id}": get_article,
+        "POST /articles/": post_article,
+        "PUT /articles/{id}": put_article,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int
+) -> Dict[str, float]:
+    """Send ``requests`` requests from ``concurrency`` concurrent clients."""
+
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            response = await scenario(client, i)
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code >= 400
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = (
+        statistics.quantiles(latencies, n=100, method="inclusive")[i] * 1e3
+        for i in (49, 94, 98)
+    )
+    return {
+        "rps": requests / elapsed,
+        "p50": p50,
+        "p95": p95,
+        "p99": p99,
+        "errors": errors,
+    }
+
+
+def regressions(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    """Describe scenarios slower than the baseline by more than ``tolerance``."""
+
+    messages = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        if result["rps"] < base["rps"] * (1 - tolerance):
+            messages += [
+                f"{name}: {result['rps']:.0f} req/s, baseline {base['rps']:.0f}"
+            ]
+        if result["p95"] > base["p95"] * (1 + tolerance):
+            messages += [
+                f"{name}: p95 {result['p95']:.1f} ms, baseline {base['p95']:.1f}"
+            ]
+    return messages
+
+
+async def benchmark(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    from app.backend.engine import get_async_engine
+    from app.main import app
+
+    data = await seed(args.users, args.articles)
+
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    async with client:
+        headers = [await login(client, email) for email in data["emails"]]
+
+        results = dict()
+        for name, scenario in scenarios(data, headers).items():
+            results[name] = await run_scenario(
+                client, scenario, args.requests, args.concurrency
+            )
+            result = results[name]
+            print(
+                f"{name:>18}: {result['rps']:8.1f} req/s  p50 {result['p50']:7.2f} ms"
+                f"  p95 {result['p95']:7.2f} ms  p99 {result['p99']:7.2f} ms"
+                f"  errors {result['errors']:.0f}"
+            )
+
+    await get_async_engine().dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--dsn", help="Database DSN, temporary SQLite by default")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--save", action="store_true", help="Store as baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # the application reads its configuration on import
+        os.environ["MYAPI_DATABASE__DSN"] = args.dsn or (
+            "sqlite:///" + os.path.join(directory, "bench.db")
+        )
+        results = asyncio.run(benchmark(args))
+
+    if args.save:
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            messages = regressions(results, json.load(file), args.tolerance)
+        for message in messages:
+            print("regression:", message)
+        if messages:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Microbenchmark of model to schema conversion.
+
+Compares per-row cost of building schemas from keyword arguments
+produced by :meth:`app.models.base.SQLModel.to_dict` with the bulk
+conversion of :meth:`app.services.base.SchemaMixin.to_schemas`.
+
+Usage:
+    python -m benchmarks.conversion [--rows 10000] [--repeat 5]
+"""
+import argparse
+import datetime
+import timeit
+from typing import (
+    Callable,
+    List,
+)
+
+from app.models.articles import ArticleModel
+from app.schemas.articles import ArticleSchema
+from app.services.base import SchemaMixin
+
+
+def make_models(rows: int) -> List[ArticleModel]:
+    now = datetime.datetime.now()
+    return [
+        ArticleModel(
+            id=i,
+            title=f"Title {i}",
+            text="Lorem ipsum " * 50,
+            author_id=1,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(rows)
+    ]
+
+
+def per_row_us(fn: Callable[[], object], rows: int, repeat: int) -> float:
+    """Return best per-row time of ``fn`` in microseconds."""
+
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) / rows * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    models = make_models(args.rows)
+
+    def kwargs_loop() -> List[ArticleSchema]:
+        schemas: List[ArticleSchema] = list()
+        for model in models:
+            schemas += [ArticleSchema(**model.to_dict())]
+        return schemas
+
+    def bulk() -> List[ArticleSchema]:
+        return SchemaMixin.to_schemas(ArticleSchema, models)
+
+    baseline = per_row_us(kwargs_loop, args.rows, args.repeat)
+    optimized = per_row_us(bulk, args.rows, args.repeat)
+
+    print(f"rows: {args.rows}")
+    print(f"to_dict + kwargs: {baseline:.2f} us/row")
+    print(f"to_schemas:       {optimized:.2f} us/row")
+    print(f"speedup:          {baseline / optimized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark of the error path.
+
+Compares raising and logging an HTTP error the legacy way, looking the
+caller up with :func:`inspect.stack`, with raising
+:class:`app.exc.NotFound` and handling it by
+:func:`app.exc.app_exception_handler`. Both are run below a stack of
+nested calls simulating the ASGI middleware and dependency frames.
+
+Usage:
+    python -m benchmarks.errors [--depth 40] [--number 2000]
+"""
+import argparse
+import inspect
+import timeit
+from typing import Callable
+
+from fastapi import status
+from fastapi.exceptions import HTTPException
+from loguru import logger
+
+from app.exc import (
+    app_exception_handler,
+    AppException,
+    NotFound,
+)
+
+
+def legacy_raise_with_log(status_code: int, detail: str) -> None:
+    desc = f'<HTTPException status_code={status_code} detail={detail}>'
+    info = inspect.getframeinfo(inspect.stack()[1][0])
+    logger.error(f'{desc} | runner={info.filename}:{info.function}:{info.lineno}')
+    raise HTTPException(status_code, detail)
+
+
+def legacy() -> None:
+    try:
+        legacy_raise_with_log(status.HTTP_404_NOT_FOUND, "Article not found.")
+    except HTTPException:
+        pass
+
+
+def current() -> None:
+    try:
+        raise NotFound("Article not found.")
+    except AppException as exc:
+        # the handler never awaits, drive it without an event loop
+        handler = app_exception_handler(None, exc)  # type: ignore[arg-type]
+        try:
+            handler.send(None)
+        except StopIteration:
+            pass
+
+
+def nested(fn: Callable[[], None], depth: int) -> Callable[[], None]:
+    def call(level: int = depth) -> None:
+        if level == 0:
+            fn()
+        else:
+            call(level - 1)
+
+    return call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=40)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    # measure the error path, not the terminal output
+    logger.remove()
+    logger.add(lambda message: None, level="ERROR")
+
+    results = {}
+    for name, fn in (("inspect.stack", legacy), ("traceback lookup", current)):
+        seconds = timeit.timeit(nested(fn, args.depth), number=args.number)
+        results[name] = seconds / args.number * 1e6
+        print(f"{name:>16}: {results[name]:.1f} us/error")
+
+    speedup = results["inspect.stack"] / results["traceback lookup"]
+    print(f"{'speedup':>16}: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
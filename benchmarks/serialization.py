@@ -0,0 +1,86 @@
+"""Benchmark of article page response serialization.
+
+Compares FastAPI's default path, validating the endpoint result against
+``response_model``, walking it with :func:`jsonable_encoder` and dumping
+it by :class:`fastapi.responses.JSONResponse`, with
+:class:`app.responses.FastJSONResponse` serializing the schemas directly.
+
+Usage:
+    python -m benchmarks.serialization [--rows 1000 10000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import datetime
+import timeit
+from typing import Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.responses import FastJSONResponse
+from app.schemas.articles import (
+    ArticlePageSchema,
+    ArticleSchema,
+)
+
+
+def make_page(rows: int) -> ArticlePageSchema:
+    now = datetime.datetime.now()
+    return ArticlePageSchema(
+        items=[
+            ArticleSchema(
+                id=i,
+                title=f"Title {i}",
+                text="Lorem ipsum " * 50,
+                author_id=1,
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(rows)
+        ],
+        next_cursor="cursor",
+    )
+
+
+def default_body(page: ArticlePageSchema) -> bytes:
+    """Render page the way FastAPI does for a returned ``response_model``."""
+
+    field = create_response_field(name="response", type_=ArticlePageSchema)
+
+    async def render() -> bytes:
+        content = await serialize_response(field=field, response_content=page)
+        return JSONResponse(content).body
+
+    return asyncio.run(render())
+
+
+def fast_body(page: ArticlePageSchema) -> bytes:
+    return FastJSONResponse(page).body
+
+
+def best_ms(fn: Callable[[], object], repeat: int) -> float:
+    """Return best time of ``fn`` in milliseconds."""
+
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        page = make_page(rows)
+        baseline = best_ms(lambda: default_body(page), args.repeat)
+        optimized = best_ms(lambda: fast_body(page), args.repeat)
+
+        print(f"rows: {rows}")
+        print(f"  jsonable_encoder + JSONResponse: {baseline:8.2f} ms")
+        print(f"  FastJSONResponse:                {optimized:8.2f} ms")
+        print(f"  speedup:                         {baseline / optimized:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
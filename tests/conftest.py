@@ -1,12 +1,22 @@
+import asyncio
+
 from fastapi.testclient import TestClient
 from pydantic_settings import (
     BaseSettings,
     SettingsConfigDict,
 )
 import pytest
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    create_async_engine,
+)
 
+from app.backend.config import config as app_config
+from app.backend.engine import engine_options
+from app.backend.metrics import instrument_engine
 from app.const import AUTH_URL
 from app.main import app
+from app.models.base import SQLModel
 
 
 client = TestClient(app)
@@ -42,3 +52,32 @@ def headers():
     schema = response.json()
 
     return {"Authorization": "Bearer " + schema["access_token"]}
+
+
+@pytest.fixture
+def run_with_session(tmp_path):
+    """Return runner of async tests in a session of a new SQLite database.
+
+    Only the tables of the given models are created.
+    """
+
+    def run(test, *models):
+        dsn = f"sqlite+aiosqlite:///{tmp_path}/test.db"
+        engine = create_async_engine(
+            dsn, **engine_options(app_config.database, dsn, is_async=True)
+        )
+        instrument_engine(engine.sync_engine)
+
+        async def main():
+            async with engine.begin() as connection:
+                await connection.run_sync(
+                    SQLModel.metadata.create_all,
+                    tables=[model.__table__ for model in models],
+                )
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                await test(session)
+            await engine.dispose()
+
+        asyncio.run(main())
+
+    return run
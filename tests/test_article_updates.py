@@ -0,0 +1,77 @@
+import pytest
+
+from app.backend.metrics import query_budget
+from app.const import ADMIN_GROUP
+from app.exc import (
+    BadRequest,
+    NotFound,
+)
+from app.models.articles import ArticleModel
+from app.models.auth import (
+    GroupModel,
+    GroupUserModel,
+    UserModel,
+)
+from app.schemas.articles import ArticleUpdateSchema
+from app.schemas.auth import UserSchema
+from app.services.articles import ArticleService
+
+
+author = UserSchema(id=1, name="author", email="author@example.com")
+admin = UserSchema(id=2, name="admin", email="admin@example.com")
+other = UserSchema(id=3, name="other", email="other@example.com")
+item = ArticleUpdateSchema(title="new title", text="new text")
+
+
+@pytest.fixture
+def run_with_service(run_with_session):
+    def run(test):
+        async def setup(session):
+            session.add(GroupModel(code=ADMIN_GROUP, name="Admins"))
+            session.add(GroupUserModel(group_id=ADMIN_GROUP, user_id=admin.id))
+            session.add(ArticleModel(id=1, title="title", text="text", author_id=1))
+            await session.commit()
+            await test(ArticleService(session))
+
+        run_with_session(setup, UserModel, GroupModel, GroupUserModel, ArticleModel)
+
+    return run
+
+
+def test_author_update_takes_one_statement(run_with_service):
+    async def test(service):
+        with query_budget(max_queries=1) as metrics:
+            article = await service.update_article(1, item, author)
+        assert metrics.sql_count == 1
+        assert (article.title, article.text) == ("new title", "new text")
+
+    run_with_service(test)
+
+
+def test_admin_update(run_with_service):
+    async def test(service):
+        # failed author update, group lookup and the update itself
+        with query_budget(max_queries=3, max_repeats=1) as metrics:
+            article = await service.update_article(1, item, admin)
+        assert metrics.sql_count == 3
+        assert article.title == "new title"
+        assert article.author_id == author.id
+
+    run_with_service(test)
+
+
+def test_update_without_permission(run_with_service):
+    async def test(service):
+        with pytest.raises(BadRequest):
+            await service.update_article(1, item, other)
+        assert (await service.get_article(1)).title == "title"
+
+    run_with_service(test)
+
+
+def test_update_missing_article(run_with_service):
+    async def test(service):
+        with pytest.raises(NotFound):
+            await service.update_article(2, item, author)
+
+    run_with_service(test)
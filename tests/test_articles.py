@@ -28,4 +28,102 @@ def test_get_articles(headers):
     response = client.get(url, headers=headers, params=params)
     schema = response.json()
     assert response.status_code == status.HTTP_200_OK
-    assert len(schema) > 0
+    assert len(schema["items"]) > 0
+
+
+def test_get_articles_pages(headers):
+    params = {"limit": 1}
+
+    url = "/" + ARTICLES_URL
+    response = client.get(url, headers=headers, params=params)
+    first = response.json()
+    assert response.status_code == status.HTTP_200_OK
+    assert len(first["items"]) == 1
+
+    if first["next_cursor"] is not None:
+        params["cursor"] = first["next_cursor"]
+        response = client.get(url, headers=headers, params=params)
+        second = response.json()
+        assert response.status_code == status.HTTP_200_OK
+        assert second["items"][0]["id"] != first["items"][0]["id"]
+
+
+def test_get_articles_invalid_cursor(headers):
+    params = {"cursor": "invalid"}
+
+    url = "/" + ARTICLES_URL
+    response = client.get(url, headers=headers, params=params)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_article_summaries(headers):
+    params = {}
+
+    url = "/" + ARTICLES_URL + "/summary"
+    response = client.get(url, headers=headers, params=params)
+    schema = response.json()
+    assert response.status_code == status.HTTP_200_OK
+    assert len(schema["items"]) > 0
+    assert "text" not in schema["items"][0]
+
+
+def test_get_article_not_modified(headers):
+    url = "/" + ARTICLES_URL + f'/{2}'
+    response = client.get(url, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    headers = dict(headers, **{"If-None-Match": response.headers["ETag"]})
+    response = client.get(url, headers=headers)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_bulk_create_and_update_articles(headers):
+    url = "/" + ARTICLES_URL + "/bulk"
+    items = [{"title": f"bulk {i}", "text": "text"} for i in range(3)]
+
+    response = client.post(url, headers=headers, json=items)
+    created = response.json()
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["status"] for item in created] == [status.HTTP_201_CREATED] * 3
+    titles = [item["article"]["title"] for item in created]
+    assert titles == ["bulk 0", "bulk 1", "bulk 2"]
+
+    items = [
+        {"id": created[0]["id"], "title": "updated", "text": "text"},
+        {"id": 0, "title": "missing", "text": "text"},
+    ]
+    response = client.put(url, headers=headers, json=items)
+    updated = response.json()
+    assert response.status_code == status.HTTP_200_OK
+    assert updated[0]["status"] == status.HTTP_200_OK
+    assert updated[0]["article"]["title"] == "updated"
+    assert updated[1]["status"] == status.HTTP_404_NOT_FOUND
+
+
+def test_search_articles(headers):
+    url = "/" + ARTICLES_URL
+    item = {"title": "Searchable article", "text": "unmistakable words"}
+    client.post(url + "/", headers=headers, json=item)
+
+    params = {"q": "unmistakable words", "limit": 1}
+    response = client.get(url + "/search", headers=headers, params=params)
+    schema = response.json()
+    assert response.status_code == status.HTTP_200_OK
+    assert schema["items"][0]["title"] == "Searchable article"
+
+
+def test_article_stats(headers):
+    url = "/" + ARTICLES_URL
+    article = {"title": "t", "text": "t"}
+    response = client.post(url + "/", headers=headers, json=article)
+    params = {"author_id": response.json()["author_id"]}
+    total = client.get(url + "/stats").json()["total"]
+    count = client.get(url + "/stats/authors", params=params).json()["items"][0]
+
+    client.post(url + "/", headers=headers, json=article)
+    assert client.get(url + "/stats").json()["total"] == total + 1
+
+    response = client.get(url + "/stats/authors", params=params)
+    schema = response.json()
+    assert response.status_code == status.HTTP_200_OK
+    assert schema["items"] == [{**count, "count": count["count"] + 1}]
\ No newline at end of file
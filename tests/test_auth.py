@@ -1,13 +1,28 @@
+import asyncio
 import pdb
+import time
 
-from fastapi import status
+from fastapi import (
+    HTTPException,
+    status,
+)
 from fastapi.testclient import TestClient
+from jose import jwt
+import pytest
 
+from app.backend.config import config as app_config
 from app.const import (
     AUTH_URL,
+    TOKEN_ALGORITHM,
     TOKEN_TYPE,
 )
 from app.main import app
+from app.schemas.auth import CurrentUserSchema
+from app.services.auth import (
+    AuthService,
+    get_current_user,
+    token_cache,
+)
 
 
 client = TestClient(app)
@@ -34,3 +49,41 @@ def test_incorrect_password(config):
 
     response = client.post("/" + AUTH_URL, data=data)
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_current_user():
+    token = AuthService(None)._create_access_token(
+        1, "name", "user@myapi.com", ["admin"]
+    )
+
+    user = asyncio.run(get_current_user(token))
+    assert user.id == 1
+    assert user.email == "user@myapi.com"
+    assert user.groups == {"admin"}
+
+    hits = token_cache.stats.hits
+    assert asyncio.run(get_current_user(token)) == user
+    assert token_cache.stats.hits == hits + 1
+
+
+def test_expired_token():
+    payload = {"id": 1, "name": "name", "email": "user@myapi.com"}
+    token = jwt.encode(
+        dict(payload, exp=int(time.time()) - 1),
+        app_config.token_key,
+        algorithm=TOKEN_ALGORITHM,
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(get_current_user(token))
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+    assert exc_info.value.detail == "Token expired"
+
+
+def test_is_admin_from_token_claim():
+    user = CurrentUserSchema(
+        id=1, name="name", email="user@myapi.com", groups={"admin"}
+    )
+
+    # no database session needed when the claim grants membership
+    assert asyncio.run(AuthService(None).is_admin(user))
@@ -0,0 +1,23 @@
+import json
+
+from benchmarks.api import regressions
+from benchmarks.serialization import (
+    default_body,
+    fast_body,
+    make_page,
+)
+
+
+def test_regressions():
+    baseline = {"GET /articles/": {"rps": 100.0, "p95": 10.0}}
+
+    within = {"GET /articles/": {"rps": 90.0, "p95": 11.0}}
+    assert regressions(within, baseline, tolerance=0.2) == []
+
+    slower = {"GET /articles/": {"rps": 50.0, "p95": 20.0}, "new": {"rps": 1.0}}
+    assert len(regressions(slower, baseline, tolerance=0.2)) == 2
+
+
+def test_fast_body_matches_default_body():
+    page = make_page(3)
+    assert json.loads(fast_body(page)) == json.loads(default_body(page))
@@ -0,0 +1,157 @@
+import asyncio
+import datetime
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+)
+
+from app.backend.cache import (
+    MemoryCacheBackend,
+    SharedCacheBackend,
+)
+from app.schemas.articles import ArticleSchema
+from app.services.articles import ArticleCache
+
+
+class LocalClient:
+    """Local stand-in for a shared key-value server."""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, Any] = dict()
+
+    async def get(self, name: str) -> Any:
+        return self.data.get(name)
+
+    async def set(self, name: str, value: bytes, ex: int | None = None) -> None:
+        self.data[name] = value
+
+    async def delete(self, *names: str) -> None:
+        for name in names:
+            self.data.pop(name, None)
+
+    async def incr(self, name: str) -> int:
+        self.data[name] = int(self.data.get(name, 0)) + 1
+        return self.data[name]
+
+
+def test_memory_lru_eviction():
+    cache = MemoryCacheBackend(ttl=60, max_entries=2)
+
+    async def run():
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        assert await cache.get("a") == 1
+        await cache.set("c", 3)
+        assert await cache.get("b") is None
+        assert await cache.get("a") == 1
+        assert await cache.get("c") == 3
+
+    asyncio.run(run())
+    assert cache.size() == 2
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 3
+    assert cache.stats.misses == 1
+
+
+def test_memory_ttl():
+    cache = MemoryCacheBackend(ttl=60, max_entries=10)
+
+    async def run():
+        await cache.set("a", 1, ttl=-1)
+        assert await cache.get("a") is None
+
+    asyncio.run(run())
+    assert cache.stats.expirations == 1
+
+
+def test_memory_counters_are_not_evicted():
+    cache = MemoryCacheBackend(ttl=60, max_entries=1)
+
+    async def run():
+        assert await cache.incr("generation") == 1
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        assert await cache.counter("generation") == 1
+
+    asyncio.run(run())
+
+
+def test_get_or_set():
+    cache = MemoryCacheBackend(ttl=60, max_entries=10)
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        return "value"
+
+    async def run():
+        assert await cache.get_or_set("a", factory) == "value"
+        assert await cache.get_or_set("a", factory) == "value"
+
+    asyncio.run(run())
+    assert len(calls) == 1
+
+
+def test_shared_backend():
+    cache = SharedCacheBackend(LocalClient(), ttl=60)
+
+    async def run():
+        await cache.set("a", {"x": 1})
+        assert await cache.get("a") == {"x": 1}
+        await cache.delete("a")
+        assert await cache.get("a") is None
+        await cache.incr("generation")
+        assert await cache.counter("generation") == 1
+
+    asyncio.run(run())
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_shared_backend_stores_json():
+    client = LocalClient()
+    cache = SharedCacheBackend(client, ttl=60)
+    now = datetime.datetime(2026, 10, 18, tzinfo=datetime.timezone.utc)
+    article = ArticleSchema(
+        id=1, title="title", text="text", author_id=2, created_at=now, updated_at=now
+    )
+
+    async def run():
+        await cache.set("article", article)
+        await cache.set("groups", frozenset({"admin"}))
+        assert await client.get("groups") == b'["admin"]'
+        assert await cache.get("article", ArticleSchema) == article
+        assert await cache.get("groups", FrozenSet[str]) == frozenset({"admin"})
+
+    asyncio.run(run())
+
+
+def test_stale_article_is_not_served_after_invalidate():
+    cache = ArticleCache(MemoryCacheBackend(ttl=60, max_entries=10))
+
+    async def run():
+        # a reader looks the article up just before a write commits
+        stale_key = await cache.article_key(1)
+        await cache.invalidate(1)
+        await cache.cache.set(stale_key, "stale")
+
+        key = await cache.article_key(1)
+        assert key != stale_key
+        assert await cache.cache.get(key) is None
+
+    asyncio.run(run())
+
+
+def test_write_keeps_other_articles_cached():
+    cache = ArticleCache(MemoryCacheBackend(ttl=60, max_entries=10))
+
+    async def run():
+        key = await cache.article_key(2)
+        await cache.cache.set(key, "cached")
+        await cache.invalidate(1)
+
+        assert await cache.article_key(2) == key
+        assert await cache.cache.get(key) == "cached"
+
+    asyncio.run(run())
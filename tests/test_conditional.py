@@ -0,0 +1,73 @@
+import datetime
+
+from fastapi import Request
+
+from app.conditional import (
+    article_etag,
+    is_not_modified,
+    page_validators,
+)
+
+
+UPDATED_AT = datetime.datetime(2023, 1, 1, 12, 0, 0, 500)
+
+
+def make_request(**headers: str) -> Request:
+    scope = {
+        "type": "http",
+        "headers": [
+            (key.replace("_", "-").encode(), value.encode())
+            for key, value in headers.items()
+        ],
+    }
+    return Request(scope)
+
+
+def test_article_etag_changes_with_version():
+    later = UPDATED_AT + datetime.timedelta(microseconds=1)
+    assert article_etag(1, UPDATED_AT) != article_etag(1, later)
+    assert article_etag(1, UPDATED_AT) != article_etag(2, UPDATED_AT)
+
+
+def test_if_none_match():
+    etag = article_etag(1, UPDATED_AT)
+    assert is_not_modified(make_request(if_none_match=etag), etag, UPDATED_AT)
+    assert is_not_modified(make_request(if_none_match="*"), etag, UPDATED_AT)
+    assert not is_not_modified(make_request(if_none_match='"x"'), etag, UPDATED_AT)
+
+
+def test_if_none_match_weak_comparison():
+    etag = article_etag(1, UPDATED_AT)
+    request = make_request(if_none_match=f'"x", W/{etag}')
+    assert is_not_modified(request, etag, UPDATED_AT)
+    assert is_not_modified(make_request(if_none_match=etag), f"W/{etag}", UPDATED_AT)
+
+
+def test_if_modified_since():
+    etag = article_etag(1, UPDATED_AT)
+    since = UPDATED_AT.astimezone(datetime.timezone.utc).strftime(
+        "%a, %d %b %Y %H:%M:%S GMT"
+    )
+    assert is_not_modified(make_request(if_modified_since=since), etag, UPDATED_AT)
+
+    later = UPDATED_AT + datetime.timedelta(seconds=1)
+    assert not is_not_modified(make_request(if_modified_since=since), etag, later)
+
+
+def test_if_modified_since_without_zone():
+    etag = article_etag(1, UPDATED_AT)
+    since = UPDATED_AT.astimezone(datetime.timezone.utc).strftime(
+        "%a, %d %b %Y %H:%M:%S -0000"
+    )
+    assert is_not_modified(make_request(if_modified_since=since), etag, UPDATED_AT)
+
+    later = UPDATED_AT + datetime.timedelta(seconds=1)
+    assert not is_not_modified(make_request(if_modified_since=since), etag, later)
+
+
+def test_page_validators():
+    versions = [(2, UPDATED_AT), (1, UPDATED_AT - datetime.timedelta(days=1))]
+    etag, last_modified = page_validators("page", versions, None)
+    assert last_modified == UPDATED_AT
+    assert etag != page_validators("summary", versions, None)[0]
+    assert etag != page_validators("page", versions, "cursor")[0]
@@ -0,0 +1,102 @@
+import datetime
+
+import pytest
+from sqlalchemy import (
+    create_engine,
+    select,
+)
+from sqlalchemy.orm import Session
+
+from app.backend.config import config
+from app.backend.engine import engine_options
+from app.models.articles import ArticleModel
+from app.models.auth import UserModel
+from app.models.base import SQLModel
+from app.services.base import (
+    AsyncBaseDataManager,
+    BaseDataManager,
+    chunks,
+)
+
+
+@pytest.fixture
+def run_with_data_manager(run_with_session):
+    def run(test):
+        async def wrap(session):
+            await test(AsyncBaseDataManager(session))
+
+        run_with_session(wrap, UserModel, ArticleModel)
+
+    return run
+
+
+def test_chunks():
+    assert list(chunks([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+
+
+def test_add_and_update_one(run_with_data_manager):
+    async def test(data_manager):
+        model = ArticleModel(title="title", text="text", author_id=1)
+        await data_manager.add_one(model)
+        assert model.id is not None
+
+        await data_manager.update_one(model, [("title", "new"), ("missing", 1)])
+        stmt = select(ArticleModel.title).where(ArticleModel.id == model.id)
+        assert await data_manager.get_one(stmt) == "new"
+
+    run_with_data_manager(test)
+
+
+def test_insert_and_update_many(run_with_data_manager):
+    async def test(data_manager):
+        values = [dict(title=f"{i}", text="text", author_id=1) for i in range(5)]
+        models = await data_manager.insert_many(ArticleModel, values, batch_size=2)
+        assert [model.title for model in models] == ["0", "1", "2", "3", "4"]
+
+        updates = [dict(id=model.id, title="updated") for model in models[:3]]
+        await data_manager.update_many(ArticleModel, updates, batch_size=2)
+        stmt = select(ArticleModel.title).order_by(ArticleModel.id)
+        titles = await data_manager.get_all(stmt)
+        assert titles == ["updated"] * 3 + ["3", "4"]
+
+    run_with_data_manager(test)
+
+
+def test_stream_rows(run_with_data_manager):
+    async def test(data_manager):
+        now = datetime.datetime.now()
+        values = [
+            dict(title=f"{i}", text="", author_id=1, created_at=now, updated_at=now)
+            for i in range(5)
+        ]
+        await data_manager.insert_many(ArticleModel, values, batch_size=10)
+
+        stmt = select(ArticleModel.id).order_by(ArticleModel.id)
+        batches = [rows async for rows in data_manager.stream_rows(stmt, size=2)]
+        assert [len(rows) for rows in batches] == [2, 2, 1]
+
+    run_with_data_manager(test)
+
+
+def test_sync_data_manager(tmp_path):
+    dsn = f"sqlite:///{tmp_path}/data.db"
+    engine = create_engine(dsn, **engine_options(config.database, dsn, is_async=False))
+    SQLModel.metadata.create_all(
+        engine, tables=[model.__table__ for model in (UserModel, ArticleModel)]
+    )
+
+    with Session(engine) as session:
+        data_manager = BaseDataManager(session)
+        model = ArticleModel(title="title", text="text", author_id=1)
+        data_manager.add_one(model)
+        data_manager.update_one(model, [("title", "new")])
+
+        values = [dict(title=f"{i}", text="text", author_id=1) for i in range(3)]
+        models = data_manager.insert_many(ArticleModel, values, batch_size=2)
+        assert [model.title for model in models] == ["0", "1", "2"]
+
+        stmt = select(ArticleModel.title).order_by(ArticleModel.id)
+        assert data_manager.get_one(stmt) == "new"
+        batches = list(data_manager.stream_rows(stmt, size=3))
+        assert [len(rows) for rows in batches] == [3, 1]
+    engine.dispose()
@@ -0,0 +1,44 @@
+from fastapi import status
+from fastapi.exceptions import HTTPException
+import pytest
+
+from app.exc import (
+    NotFound,
+    raise_with_log,
+    runner_info,
+    Unauthorized,
+)
+
+
+def raise_not_found() -> None:
+    raise NotFound("Article not found.")
+
+
+def test_raise_with_log_maps_status_code():
+    with pytest.raises(NotFound) as exc_info:
+        raise_with_log(status.HTTP_404_NOT_FOUND, "Article not found.")
+    assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+    assert exc_info.value.detail == "Article not found."
+
+    with pytest.raises(HTTPException) as exc_info:
+        raise_with_log(status.HTTP_409_CONFLICT, "Conflict.")
+    assert exc_info.value.status_code == status.HTTP_409_CONFLICT
+
+
+def test_unauthorized_headers():
+    assert Unauthorized().headers == {"WWW-Authenticate": "Bearer"}
+
+
+def test_runner_info():
+    with pytest.raises(NotFound) as exc_info:
+        raise_not_found()
+    location = runner_info(exc_info.value.__traceback__)
+    assert location.startswith(__file__ + ":raise_not_found:")
+
+
+def test_runner_info_skips_raise_with_log():
+    with pytest.raises(NotFound) as exc_info:
+        raise_with_log(status.HTTP_404_NOT_FOUND, "Article not found.")
+    assert ":test_runner_info_skips_raise_with_log:" in runner_info(
+        exc_info.value.__traceback__
+    )
@@ -0,0 +1,89 @@
+import asyncio
+import csv
+import datetime
+import io
+import json
+from typing import (
+    AsyncIterator,
+    List,
+)
+
+from app.export import (
+    export_chunks,
+    ExportFormat,
+    read_records,
+)
+from app.schemas.articles import ArticleSchema
+
+
+CREATED_AT = datetime.datetime(2023, 1, 1, 12, 0, 0)
+
+
+def make_article(article_id: int) -> ArticleSchema:
+    return ArticleSchema(
+        id=article_id,
+        title=f"title, {article_id}",
+        text="first line\nsecond line",
+        author_id=1,
+        created_at=CREATED_AT,
+        updated_at=CREATED_AT,
+    )
+
+
+async def batches(*sizes: int) -> AsyncIterator[List[ArticleSchema]]:
+    article_id = 0
+    for size in sizes:
+        yield [make_article(article_id + i) for i in range(1, size + 1)]
+        article_id += size
+
+
+def export(
+        export_format: ExportFormat, *sizes: int, header: bool = True
+) -> List[str]:
+    async def collect() -> List[str]:
+        chunks = export_chunks(ArticleSchema, batches(*sizes), export_format, header)
+        return [chunk async for chunk in chunks]
+
+    return asyncio.run(collect())
+
+
+def test_export_ndjson():
+    chunks = export(ExportFormat.ndjson, 2, 1)
+    assert len(chunks) == 2
+
+    lines = "".join(chunks).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
+    assert ArticleSchema.model_validate_json(lines[0]) == make_article(1)
+
+
+def test_export_csv():
+    chunks = export(ExportFormat.csv, 2, 1)
+    assert len(chunks) == 2
+
+    rows = list(csv.DictReader("".join(chunks).splitlines(keepends=True)))
+    assert [row["id"] for row in rows] == ["1", "2", "3"]
+    assert rows[0]["title"] == "title, 1"
+    assert rows[0]["text"] == "first line\nsecond line"
+
+
+def test_export_csv_empty():
+    header = "id,title,text,author_id,created_at,updated_at\r\n"
+    assert export(ExportFormat.csv) == [header]
+
+
+def test_export_csv_without_header():
+    chunks = export(ExportFormat.csv, 2, header=False)
+    rows = list(csv.reader("".join(chunks).splitlines(keepends=True)))
+    assert [row[0] for row in rows] == ["1", "2"]
+    assert export(ExportFormat.csv, header=False) == []
+
+
+def test_read_records():
+    data = "name,email,password\nuser,user@myapi.com,secret\n"
+    records = list(read_records(io.StringIO(data), ExportFormat.csv))
+    user = {"name": "user", "email": "user@myapi.com", "password": "secret"}
+    assert records == [user]
+
+    data = '{"name": "user"}\n\n{"name": "other"}\n'
+    records = list(read_records(io.StringIO(data), ExportFormat.ndjson))
+    assert records == [{"name": "user"}, {"name": "other"}]
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+from app.backend.hashing import HashingExecutor
+from app.services.auth import (
+    hash_passwords,
+    HashingMixin,
+    pwd_context,
+)
+
+
+def test_bcrypt_verify():
+    async def run():
+        hashed = await HashingMixin.bcrypt("secret")
+        assert await HashingMixin.verify(hashed, "secret")
+        assert not await HashingMixin.verify(hashed, "wrong")
+
+    asyncio.run(run())
+
+
+def test_executor_runs_off_event_loop():
+    executor = HashingExecutor(workers=2, queue_size=0)
+    loop_thread = threading.get_ident()
+
+    async def run():
+        return await executor.run(threading.get_ident)
+
+    assert asyncio.run(run()) != loop_thread
+    executor.shutdown()
+
+
+def test_executor_is_bounded():
+    executor = HashingExecutor(workers=2, queue_size=1)
+    release = threading.Event()
+    started = []
+
+    def job(i):
+        started.append(i)
+        release.wait(5)
+        return i
+
+    async def run():
+        tasks = [asyncio.create_task(executor.run(job, i)) for i in range(5)]
+        await asyncio.sleep(0.1)
+
+        # 2 jobs run and 1 waits in the pool, the rest wait for a slot
+        assert len(started) == 2
+        assert executor._slots.locked()
+        assert not any(task.done() for task in tasks)
+
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+    executor.shutdown()
+
+
+def test_executor_map_keeps_order():
+    executor = HashingExecutor(workers=3, queue_size=0, processes=True)
+
+    async def run():
+        return await executor.map(hash_passwords, ["a", "b", "c", "d"])
+
+    hashed = asyncio.run(run())
+    executor.shutdown()
+    assert [pwd_context.verify(p, h) for p, h in zip("abcd", hashed)] == [True] * 4
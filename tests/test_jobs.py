@@ -0,0 +1,126 @@
+import asyncio
+from typing import (
+    Dict,
+    List,
+)
+
+from app.backend.jobs import (
+    Job,
+    JobQueue,
+    MemoryJobBackend,
+    SharedJobBackend,
+)
+
+
+class ListClient:
+    """Local stand-in of the key-value server lists."""
+
+    def __init__(self) -> None:
+        self.lists: Dict[str, List[bytes]] = dict()
+
+    async def rpush(self, name, *values):
+        self.lists.setdefault(name, []).extend(values)
+        return len(self.lists[name])
+
+    async def lmove(self, first_list, second_list, src, dest):
+        source = self.lists.get(first_list)
+        if not source:
+            return None
+        value = source.pop(0 if src == "LEFT" else -1)
+        target = self.lists.setdefault(second_list, [])
+        target.insert(0 if dest == "LEFT" else len(target), value)
+        return value
+
+    async def blmove(self, first_list, second_list, timeout, src, dest):
+        value = await self.lmove(first_list, second_list, src, dest)
+        if value is None:
+            await asyncio.sleep(0.01)
+        return value
+
+    async def lrem(self, name, count, value):
+        self.lists[name].remove(value)
+
+
+def create_queue(backend):
+    queue = JobQueue(backend, workers=2, max_retries=2, retry_delay=0.01)
+    done = []
+
+    @queue.job("append")
+    async def append(value):
+        done.append(value)
+
+    return queue, done
+
+
+def test_jobs_run_inline_until_started():
+    queue, done = create_queue(MemoryJobBackend(10))
+    asyncio.run(queue.enqueue("append", value=1))
+    assert done == [1]
+
+
+def test_drain_waits_for_queued_jobs():
+    queue, done = create_queue(MemoryJobBackend(10))
+
+    async def run():
+        await queue.start()
+        for i in range(5):
+            await queue.enqueue("append", value=i)
+        await queue.drain(timeout=1)
+        assert not queue.running
+
+    asyncio.run(run())
+    assert sorted(done) == [0, 1, 2, 3, 4]
+
+
+def test_failed_job_is_retried():
+    queue, done = create_queue(MemoryJobBackend(10))
+    attempts = []
+
+    @queue.job("flaky")
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("try again")
+        done.append("flaky")
+
+    @queue.job("broken")
+    async def broken():
+        attempts.append(0)
+        raise RuntimeError("never works")
+
+    async def run():
+        await queue.start()
+        await queue.enqueue("flaky")
+        await queue.drain(timeout=1)
+        assert done == ["flaky"]
+
+        attempts.clear()
+        await queue.start()
+        await queue.enqueue("broken")
+        await queue.drain(timeout=1)
+        assert len(attempts) == 3
+
+    asyncio.run(run())
+
+
+def test_shared_backend_recovers_unfinished_jobs():
+    client = ListClient()
+
+    async def run():
+        backend = SharedJobBackend(client)
+        await backend.put(Job("append", {"value": 1}))
+        await backend.put(Job("append", {"value": 2}))
+
+        # the process stops while processing the first job
+        job = await backend.get()
+        assert job.kwargs == {"value": 1}
+
+        queue, done = create_queue(SharedJobBackend(client))
+        await queue.start()
+        await asyncio.sleep(0.1)
+        await queue.drain(timeout=1)
+        return done
+
+    assert asyncio.run(run()) == [1, 2]
+    assert client.lists["jobs"] == []
+    assert client.lists["jobs:processing:default"] == []
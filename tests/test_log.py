@@ -0,0 +1,86 @@
+import io
+import json
+import sys
+
+from loguru import logger
+
+from app.backend.log import (
+    BatchingSink,
+    json_line,
+    LogSampler,
+)
+
+
+def test_sampler_limits_records_per_window():
+    sampler = LogSampler(limit=2, window=60)
+    assert [sampler.sample("401") for _ in range(4)] == [0, 0, None, None]
+    assert sampler.sample("404") == 0
+
+    sampler.window = 0
+    assert sampler.sample("401") == 2
+
+
+def test_sampler_disabled():
+    sampler = LogSampler(limit=None, window=60)
+    assert all(sampler.sample("401") == 0 for _ in range(100))
+
+
+def test_batching_sink_writes_json():
+    stream = io.StringIO()
+    sink = BatchingSink(stream, json_line, queue_size=100, batch_size=10)
+    handler_id = logger.add(sink, format="{message}")
+    try:
+        logger.bind(route="/articles/").error("Invalid token {}", 1)
+        sink.join()
+    finally:
+        logger.remove(handler_id)
+
+    record = json.loads(stream.getvalue())
+    assert record["level"] == "ERROR"
+    assert record["message"] == "Invalid token 1"
+    assert record["route"] == "/articles/"
+
+
+def test_batching_sink_drops_records_when_full():
+    class Message:
+        record = None
+
+    sink = BatchingSink(io.StringIO(), json_line, queue_size=1, batch_size=10)
+    sink.stop()
+    sink.write(Message())
+    sink.write(Message())
+    assert sink.dropped == 1
+
+
+def test_batching_sink_survives_write_errors(monkeypatch):
+    class FailingStream(io.StringIO):
+        failures = 1
+
+        def write(self, text):
+            if self.failures:
+                self.failures -= 1
+                raise OSError("disk full")
+            return super().write(text)
+
+    errors = io.StringIO()
+    monkeypatch.setattr(sys, "__stderr__", errors)
+    stream = FailingStream()
+    sink = BatchingSink(stream, json_line, queue_size=100, batch_size=10)
+    handler_id = logger.add(sink, format="{message}")
+    try:
+        logger.error("lost")
+        assert sink.join(timeout=5)
+        logger.error("written")
+        assert sink.join(timeout=5)
+    finally:
+        logger.remove(handler_id)
+
+    assert json.loads(stream.getvalue())["message"] == "written"
+    assert "Failed to write 1 log records" in errors.getvalue()
+
+
+def test_batching_sink_join_timeout():
+    sink = BatchingSink(io.StringIO(), json_line, queue_size=10, batch_size=10)
+    sink.stop()
+    sink._queue.put({})
+    assert not sink.join(timeout=0.01)
@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+
+# maximum time allowed to import the application module, in seconds
+IMPORT_TIME_BUDGET = 3.0
+
+
+def test_import_time():
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "import app.main\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    # unreachable database must not prevent the application from importing
+    env = dict(os.environ, MYAPI_DATABASE__DSN="postgresql://user@127.0.0.1:1/db")
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert float(result.stdout) < IMPORT_TIME_BUDGET
@@ -0,0 +1,110 @@
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import (
+    create_engine,
+    text,
+)
+
+from app.backend.config import config
+from app.backend.metrics import (
+    Histogram,
+    instrument_engine,
+    MetricsRegistry,
+    query_budget,
+    QueryBudgetExceeded,
+    RequestMetrics,
+)
+from app.const import ADMIN_GROUP
+from app.main import app
+from app.services.auth import AuthService
+
+
+client = TestClient(app)
+
+
+def test_histogram_is_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 5.0):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [("0.1", 1), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.sum == 6.25
+
+
+def test_server_timing():
+    metrics = RequestMetrics()
+    metrics.sql_count = 2
+    metrics.sql_time = 0.003
+    metrics.add("bcrypt", 0.25)
+
+    assert metrics.server_timing(0.5) == (
+        'sql;dur=3.00;desc="2 queries", bcrypt;dur=250.00, total;dur=500.00'
+    )
+
+
+def test_render():
+    registry = MetricsRegistry()
+    metrics = RequestMetrics()
+    metrics.sql_count = 3
+    registry.observe_request("GET", "/articles/{id}", 200, 0.02, metrics)
+
+    text = registry.render()
+    labels = 'method="GET",route="/articles/{id}"'
+    assert f'http_request_duration_seconds_count{{{labels},status="200"}} 1' in text
+    assert f"sql_statements_total{{{labels}}} 3" in text
+
+
+def test_internal_endpoints_require_admin(monkeypatch):
+    assert client.get("/metrics").status_code == 401
+
+    auth = AuthService(None)
+    token = auth._create_access_token(1, "admin", "admin@example.com", [ADMIN_GROUP])
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+    monkeypatch.setattr(config.metrics, "public_endpoints", True)
+    assert client.get("/internal/cache").status_code == 200
+
+
+def test_timing_middleware(monkeypatch):
+    monkeypatch.setattr(config.metrics, "public_endpoints", True)
+    response = client.get("/internal/cache")
+    assert response.headers["Server-Timing"].startswith('sql;dur=0.00;desc="0 queries"')
+
+    response = client.get("/metrics")
+    assert 'route="/internal/cache",status="200"' in response.text
+
+
+def test_query_budget():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    with engine.connect() as connection:
+        with query_budget(max_queries=3) as outer:
+            with query_budget(max_queries=2) as inner:
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+            connection.execute(text("SELECT 3"))
+        assert inner.sql_count == 2
+        assert outer.sql_count == 3
+
+        with pytest.raises(QueryBudgetExceeded, match="budget of 1"):
+            with query_budget(max_queries=1):
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+
+
+def test_repeated_query():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    with engine.connect() as connection:
+        with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+            with query_budget(max_repeats=2):
+                for i in range(3):
+                    connection.execute(text("SELECT :i"), {"i": i})
+
+        with query_budget(max_repeats=2, strict=False) as metrics:
+            for i in range(5):
+                connection.execute(text("SELECT :i"), {"i": i})
+        assert metrics.statements["SELECT ?"] == 5
@@ -5,6 +5,8 @@ from sqlalchemy.orm import (
 )
 
 from app.models.base import SQLModel
+from app.schemas.base import BaseSchema
+from app.services.base import SchemaMixin
 
 
 class Model(SQLModel):
@@ -20,6 +22,11 @@ class Schema(BaseModel):
     y: str
 
 
+class AttributesSchema(BaseSchema):
+    x: int
+    y: str
+
+
 def test_schema():
     assert Model.schema() == "test_schema"
 
@@ -37,3 +44,10 @@ def test_dict():
     schema = Schema(**model.to_dict())
     assert schema.x == 1
     assert schema.y == "AAA"
+
+
+def test_to_schemas():
+    models = [Model(x=1, y="AAA"), Model(x=2, y="BBB")]
+    schemas = SchemaMixin.to_schemas(AttributesSchema, models)
+    assert [schema.x for schema in schemas] == [1, 2]
+    assert [schema.y for schema in schemas] == ["AAA", "BBB"]
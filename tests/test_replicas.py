@@ -0,0 +1,92 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    create_async_engine,
+)
+
+from app.backend.cache import (
+    get_cache,
+    NullCacheBackend,
+)
+from app.backend.config import DatabaseConfig
+from app.backend.replicas import (
+    ReplicaRouter,
+    ReplicaSession,
+)
+from app.backend.session import USE_CACHE
+from app.services.articles import ArticleService
+
+
+def test_replica_async_dsns():
+    database = DatabaseConfig(replica_dsns=["postgresql://user@replica/db"])
+    assert database.get_replica_async_dsns() == [
+        "postgresql+asyncpg://user@replica/db"
+    ]
+
+
+def test_round_robin(tmp_path):
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/{i}.db") for i in range(2)
+    ]
+    router = ReplicaRouter(engines)
+    assert [router.choose() for _ in range(4)] == [0, 1, 0, 1]
+    assert router.choose(exclude=[0]) == 1
+
+
+def test_least_connections(tmp_path):
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/{i}.db") for i in range(2)
+    ]
+    router = ReplicaRouter(engines, strategy="least_connections")
+    router.checked_out = lambda index: [3, 1][index]  # type: ignore[method-assign]
+    assert router.choose() == 1
+
+
+def test_failing_replica_is_ejected(tmp_path):
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/broken.db"),
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/healthy.db"),
+    ]
+    router = ReplicaRouter(engines, retry_interval=0.05)
+
+    async def run():
+        session = AsyncSession(sync_session_class=ReplicaSession, router=router)
+        # nothing is chosen until the first statement
+        assert router.healthy() == [0, 1]
+
+        assert await session.scalar(text("SELECT 1")) == 1
+        bind = await session.run_sync(lambda sync_session: sync_session.get_bind())
+        assert bind is engines[1].sync_engine
+        await session.close()
+        assert router.healthy() == [1]
+
+        await asyncio.sleep(0.05)
+        assert router.healthy() == [0, 1]
+
+    asyncio.run(run())
+
+
+def test_no_healthy_replica_uses_primary(tmp_path):
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/primary.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/broken.db")
+    router = ReplicaRouter([engine])
+
+    async def run():
+        session = AsyncSession(
+            primary, sync_session_class=ReplicaSession, router=router
+        )
+        assert await session.scalar(text("SELECT 1")) == 1
+        bind = await session.run_sync(lambda sync_session: sync_session.get_bind())
+        assert bind is primary.sync_engine
+        await session.close()
+
+    asyncio.run(run())
+    assert router.choose() is None
+
+
+def test_primary_reads_bypass_cache():
+    session = AsyncSession(info={USE_CACHE: False})
+    assert isinstance(ArticleService(session).cache.cache, NullCacheBackend)
+    assert ArticleService(AsyncSession()).cache.cache is get_cache()
@@ -0,0 +1,29 @@
+from fastapi import Response
+
+from app.backend.config import config
+from app.responses import (
+    json_response,
+    respond,
+)
+from app.schemas.articles import ArticleStatsSchema
+
+
+def test_json_response_keeps_headers():
+    response = Response()
+    del response.headers["content-length"]
+    response.headers["ETag"] = '"1"'
+    response.set_cookie("name", "value")
+
+    fast = json_response([ArticleStatsSchema(total=1)], response)
+    assert fast.body == b'[{"total":1}]'
+    assert fast.headers["etag"] == '"1"'
+    assert fast.headers["set-cookie"].startswith("name=value")
+    assert fast.headers["content-length"] == str(len(fast.body))
+
+
+def test_respond_is_opt_in(monkeypatch):
+    stats = ArticleStatsSchema(total=1)
+    assert respond(stats, Response()) is stats
+
+    monkeypatch.setattr(config, "fast_json_responses", True)
+    assert respond(stats, Response()).body == b'{"total":1}'
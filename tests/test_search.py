@@ -0,0 +1,51 @@
+from app.search import (
+    InvertedIndex,
+    tokenize,
+)
+
+
+def test_tokenize():
+    assert tokenize("Fast, API!") == ["fast", "api"]
+
+
+def test_search_matches_all_tokens():
+    index = InvertedIndex()
+    index.add(1, "Fast API", "python web framework")
+    index.add(2, "Python tips", "python tricks")
+    index.add(3, "Cooking", "soup")
+
+    assert index.search("python") == [(2.0, 2), (1.0, 1)]
+    assert index.search("python web") == [(2.0, 1)]
+    assert index.search("missing") == []
+    assert index.search("!") == []
+
+
+def test_search_reindex_and_remove():
+    index = InvertedIndex()
+    index.add(1, "python")
+    index.add(1, "soup")
+    assert index.search("python") == []
+    assert index.search("soup") == [(1.0, 1)]
+
+    index.remove(1)
+    assert index.search("soup") == []
+    assert len(index) == 0
+
+
+def test_writes_during_build_are_applied():
+    index = InvertedIndex()
+    index.update(1, "ignored before the build")
+    assert len(index) == 0
+
+    index.begin_build()
+    index.update(1, "new python")
+    # snapshot row read before the write committed
+    index.add(1, "old soup")
+    index.finish_build()
+
+    assert index.loaded
+    assert index.search("python") == [(1.0, 1)]
+    assert index.search("soup") == []
+
+    index.update(2, "python")
+    assert len(index) == 2
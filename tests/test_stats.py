@@ -0,0 +1,49 @@
+from sqlalchemy import (
+    func,
+    select,
+    update,
+)
+
+from app.const import ARTICLES_TOTAL_STRIPES
+from app.models.articles import (
+    ArticleCountModel,
+    ArticleModel,
+    ArticleTotalModel,
+)
+from app.models.auth import UserModel
+from app.schemas.articles import ArticleCreateSchema
+from app.services.articles import ArticleService
+
+
+def test_article_counters(run_with_session):
+    item = ArticleCreateSchema(title="title", text="text")
+
+    async def test(session):
+        service = ArticleService(session)
+        assert (await service.get_stats()).total == 0
+
+        await service.create_article(item, 2)
+        await service.create_article(item, 2)
+        await service.create_articles([item] * 3, 1)
+        assert (await service.get_stats()).total == 5
+        stripes = await session.scalar(select(func.count(ArticleTotalModel.stripe)))
+        assert 1 <= stripes <= min(3, ARTICLES_TOTAL_STRIPES)
+
+        page = await service.get_author_stats(limit=1)
+        assert [(i.author_id, i.count) for i in page.items] == [(1, 3)]
+        page = await service.get_author_stats(limit=1, cursor=page.next_cursor)
+        assert [(i.author_id, i.count) for i in page.items] == [(2, 2)]
+        assert page.next_cursor is None
+
+        page = await service.get_author_stats(limit=10, author_ids=[2, 3])
+        assert [i.author_id for i in page.items] == [2]
+
+        await session.execute(update(ArticleCountModel).values(count=0))
+        await session.execute(update(ArticleTotalModel).values(count=0))
+        assert (await service.refresh_stats()).total == 5
+        page = await service.get_author_stats(limit=10)
+        assert [(i.author_id, i.count) for i in page.items] == [(1, 3), (2, 2)]
+
+    run_with_session(
+        test, UserModel, ArticleModel, ArticleCountModel, ArticleTotalModel
+    )